@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+Benchmark for building the local index with a process pool.
+
+Generates a synthetic corpus, builds the index with an increasing number of
+workers and reports the wall time, speedup and speedup per core.
+
+Run with: uv run python benchmarks/bench_index.py --posts 5000
+"""
+import argparse
+import os
+import random
+import sys
+import time
+
+# Add src directory to path so we can import modules
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src'))
+
+import preprocess
+from build import build_index
+
+WORDS = (
+    "python django flask api data science pandas numpy git github docker testing "
+    "pytest deploy cloud server client request response token auth jwt model view "
+    "template query index search cache memory thread process async await blog post"
+).split()
+
+
+def make_corpus(count: int, seed: int = 42) -> list[dict]:
+    """Generate `count` markdown posts with front matter, headings and paragraphs"""
+    rng = random.Random(seed)
+    posts = []
+    for number in range(count):
+        tags = rng.sample(WORDS, 3)
+        sections = []
+        for section in range(rng.randint(3, 8)):
+            paragraphs = [' '.join(rng.choices(WORDS, k=rng.randint(40, 120))) for _ in range(rng.randint(2, 5))]
+            sections.append(f"## Section {section}\n\n" + "\n\n".join(paragraphs))
+
+        day = 1 + number % 28
+        path = f"_posts/2024-01-{day:02d}-post-{number}.md"
+        posts.append({
+            "title": f"Post {number} about {' '.join(tags)}",
+            "url": f"https://raw.githubusercontent.com/example/blog/main/{path}",
+            "path": path,
+            "slug": f"post-{number}",
+            "content": f"---\ntitle: Post {number}\ntags: [{', '.join(tags)}]\nlang: en\n---\n\n" + "\n\n".join(sections),
+        })
+    return posts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--posts", type=int, default=2000, help="Number of synthetic posts")
+    parser.add_argument("--max-workers", type=int, default=os.cpu_count() or 1, help="Largest worker count to try")
+    args = parser.parse_args()
+
+    corpus = make_corpus(args.posts)
+    worker_counts = sorted({1, *[2 ** n for n in range(1, 8) if 2 ** n <= args.max_workers], args.max_workers})
+
+    print(f"Building index for {args.posts} posts\n")
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8} {'per core':>9}")
+
+    baseline = None
+    for workers in worker_counts:
+        # Start cold every time, the cache would otherwise skip all parsing
+        preprocess._derived_cache.clear()
+        posts = [dict(post) for post in corpus]
+
+        start = time.perf_counter()
+        build_index(posts, workers)
+        elapsed = time.perf_counter() - start
+
+        baseline = baseline or elapsed
+        speedup = baseline / elapsed
+        print(f"{workers:>8} {elapsed:>9.2f} {speedup:>7.2f}x {speedup / workers:>8.2f}x")
+
+
+if __name__ == "__main__":
+    main()
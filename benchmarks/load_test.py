@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+End-to-end load test of the MCP server over the stdio JSON-RPC transport.
+
+Generates a synthetic blog checkout, starts a local stub for the upstream
+services (llms.txt and SerpApi), then drives concurrent MCP client sessions,
+each talking to its own server subprocess, with a mixed workload of
+`get_post_content` and `search_posts` calls. Reports throughput, p50/p99
+latency per tool and the memory growth of the server processes over time.
+
+Run with: uv run python benchmarks/load_test.py --sessions 4 --concurrency 8 --duration 30
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse
+
+from mcp import ClientSession, StdioServerParameters
+from mcp.client.stdio import stdio_client
+
+from bench_index import WORDS, make_corpus
+
+SRC_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'src')
+
+# Runs inside each server subprocess: points SerpApi at the stub, samples the
+# resident memory to a file, then starts the server like `python src/server.py`
+SERVER_BOOTSTRAP = """
+import os, runpy, sys, threading, time
+sys.path.insert(0, {src_dir!r})
+from serpapi.serp_api_client import SerpApiClient
+SerpApiClient.BACKEND = {backend!r}
+
+def sample_memory():
+    page_size = os.sysconf("SC_PAGE_SIZE")
+    with open({memory_log!r}, "a") as log:
+        while True:
+            with open("/proc/self/statm") as statm:
+                rss = int(statm.read().split()[1]) * page_size
+            log.write(f"{{time.time()}} {{rss}}\\n")
+            log.flush()
+            time.sleep({interval})
+
+if os.path.exists("/proc/self/statm"):
+    threading.Thread(target=sample_memory, daemon=True).start()
+runpy.run_path(os.path.join({src_dir!r}, "server.py"), run_name="__main__")
+"""
+
+
+def write_checkout(posts: list[dict], root: str):
+    """Write the synthetic posts to a blog checkout directory"""
+    for post in posts:
+        path = os.path.join(root, post["path"])
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(post["content"])
+
+
+def start_upstream_stub(posts: list[dict], latency: float) -> ThreadingHTTPServer:
+    """Serve llms.txt and SerpApi-shaped search results from a background thread"""
+    llms_txt = "# LLM Feed\n\n## All posts\n\n" + "\n".join(f"- [{p['title']}]({p['url']})" for p in posts)
+    slugs = [post["slug"] for post in posts]
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            path = urlparse(self.path).path
+            if path == "/llms.txt":
+                body, content_type = llms_txt.encode(), "text/plain"
+            elif path == "/search":
+                results = [
+                    {"title": f"Post {slug}", "link": f"https://blog.example/{slug}/", "snippet": "Stub snippet"}
+                    for slug in random.sample(slugs, min(5, len(slugs)))
+                ]
+                body = json.dumps({"search_metadata": {"status": "Success"}, "organic_results": results}).encode()
+                content_type = "application/json"
+            else:
+                self.send_error(404)
+                return
+
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def check_result(tool: str, arguments: dict, result, contents: dict) -> str | None:
+    """
+    Return why a tool result is wrong, or None if it is the expected answer.
+
+    The tools report failures as plain text results, so the text is checked too:
+    `get_post_content` must return the post body and `search_posts` must find posts.
+    """
+    if result.isError:
+        return f"{tool}: error result"
+
+    text = ''.join(getattr(block, "text", "") for block in result.content)
+    if tool == "get_post_content" and text != contents[arguments["title"]]:
+        return f"{tool}: unexpected content {text[:80]!r}"
+    if tool == "search_posts" and not text.startswith("Found"):
+        return f"{tool}: unexpected result {text[:80]!r}"
+    return None
+
+
+async def run_session(params: StdioServerParameters, contents: dict, args, latencies: dict, errors: list,
+                      window: dict, errlog):
+    """Open one MCP session and replay the mixed workload with `args.concurrency` requests in flight"""
+    titles = list(contents)
+    async with stdio_client(params, errlog=errlog) as (read, write):
+        async with ClientSession(read, write) as session:
+            await session.initialize()
+            # Warm up so the corpus load is not counted as request latency, and
+            # stop early if the server cannot serve posts at all
+            arguments = {"title": titles[0]}
+            error = check_result("get_post_content", arguments,
+                                 await session.call_tool("get_post_content", arguments), contents)
+            if error:
+                raise RuntimeError(f"Warm-up call failed, {error}")
+
+            window["start"] = min(window.get("start", time.time()), time.time())
+            deadline = time.perf_counter() + args.duration
+
+            async def worker():
+                while time.perf_counter() < deadline:
+                    if random.random() < args.search_ratio:
+                        tool, arguments = "search_posts", {"query": ' '.join(random.sample(WORDS, 2))}
+                    else:
+                        tool, arguments = "get_post_content", {"title": random.choice(titles)}
+
+                    start = time.perf_counter()
+                    try:
+                        error = check_result(tool, arguments, await session.call_tool(tool, arguments), contents)
+                        if error:
+                            errors.append(error)
+                    except Exception as e:
+                        errors.append(f"{tool}: {e}")
+                    latencies[tool].append(time.perf_counter() - start)
+
+            await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+            window["end"] = max(window.get("end", 0), time.time())
+
+
+def percentile(values: list[float], fraction: float) -> float:
+    """Return the nearest-rank percentile of `values`"""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(fraction * len(ordered)))]
+
+
+def report_memory(memory_logs: list[str], interval: float, start: float):
+    """Print the total resident memory of the server processes over time, relative to the workload start"""
+    samples = {}
+    for log_path in memory_logs:
+        if not os.path.exists(log_path):
+            continue
+        with open(log_path) as f:
+            for line in f:
+                timestamp, rss = line.split()
+                bucket = int((float(timestamp) - start) // interval)
+                samples.setdefault(bucket, {})[log_path] = int(rss)
+
+    if not samples:
+        print("\nMemory: not available on this platform")
+        return
+
+    print(f"\n{'seconds':>8} {'total RSS MiB':>14}")
+    under_load = []
+    for bucket in sorted(samples):
+        total = sum(samples[bucket].values()) / 2**20
+        if bucket >= 0:
+            under_load.append(total)
+        print(f"{bucket * interval:>8.0f} {total:>14.1f}")
+
+    if under_load:
+        print(f"Memory growth under load: {under_load[-1] - under_load[0]:+.1f} MiB")
+
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sessions", type=int, default=4, help="Concurrent MCP sessions (server processes)")
+    parser.add_argument("--concurrency", type=int, default=8, help="Requests in flight per session")
+    parser.add_argument("--duration", type=float, default=30, help="Seconds to run the workload")
+    parser.add_argument("--posts", type=int, default=500, help="Number of synthetic posts")
+    parser.add_argument("--search-ratio", type=float, default=0.5, help="Fraction of calls that are search_posts")
+    parser.add_argument("--search-mode", default="serpapi", choices=["serpapi", "hybrid"], help="Server search mode")
+    parser.add_argument("--upstream-latency", type=float, default=0.0, help="Seconds added to every stub response")
+    parser.add_argument("--memory-interval", type=float, default=1.0, help="Seconds between memory samples")
+    args = parser.parse_args()
+
+    posts = make_corpus(args.posts)
+    contents = {post["title"]: post["content"] for post in posts}
+    upstream = start_upstream_stub(posts, args.upstream_latency)
+    base_url = f"http://127.0.0.1:{upstream.server_address[1]}"
+
+    with tempfile.TemporaryDirectory() as workdir:
+        checkout = os.path.join(workdir, "blog")
+        write_checkout(posts, checkout)
+
+        env = {
+            **os.environ,
+            "ENV": "production",
+            "BLOG_BASE_URL": base_url,
+            "BLOG_SOURCE_PATH": checkout,
+            "SERPAPI_KEY": "stub",
+            "SEARCH_MODE": args.search_mode,
+            "LOG_LEVEL": "WARNING",
+        }
+        memory_logs = [os.path.join(workdir, f"memory-{session}.log") for session in range(args.sessions)]
+        sessions = []
+        for memory_log in memory_logs:
+            bootstrap = SERVER_BOOTSTRAP.format(
+                src_dir=SRC_DIR, backend=base_url, memory_log=memory_log, interval=args.memory_interval
+            )
+            sessions.append(StdioServerParameters(command=sys.executable, args=["-c", bootstrap], env=env))
+
+        latencies = {"get_post_content": [], "search_posts": []}
+        errors = []
+        window = {}
+        print(f"Running {args.sessions} session(s) x {args.concurrency} in flight for {args.duration:.0f}s "
+              f"over {args.posts} posts (search mode: {args.search_mode})\n")
+
+        # Server logs go to a file so they do not drown the report
+        with open(os.path.join(workdir, "server.log"), "w") as errlog:
+            await asyncio.gather(*(
+                run_session(params, contents, args, latencies, errors, window, errlog) for params in sessions
+            ))
+        elapsed = window["end"] - window["start"]
+
+        upstream.shutdown()
+
+        total = sum(len(values) for values in latencies.values())
+        print(f"{'tool':<18} {'calls':>7} {'req/s':>8} {'p50 ms':>8} {'p99 ms':>8}")
+        for tool, values in [*latencies.items(), ("all", [v for values in latencies.values() for v in values])]:
+            if values:
+                print(f"{tool:<18} {len(values):>7} {len(values) / elapsed:>8.1f} "
+                      f"{percentile(values, 0.5) * 1000:>8.1f} {percentile(values, 0.99) * 1000:>8.1f}")
+        print(f"\n{total} call(s) in {elapsed:.1f}s, {len(errors)} error(s)")
+        for error, count in Counter(errors).most_common(5):
+            print(f"  {count:>6} x {error}")
+
+        report_memory(memory_logs, args.memory_interval, window["start"])
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
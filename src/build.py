@@ -0,0 +1,51 @@
+import logging
+import math
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+from index import PostIndex
+from preprocess import DERIVED_KEYS, apply_cached, preprocess_posts
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+# Below this many posts per shard, pickling costs more than the work saved
+MIN_SHARD_SIZE = 64
+
+
+def _preprocess_shard(posts: list[dict]) -> list[dict]:
+    """Preprocess a shard of posts in a worker process and return their derived forms"""
+    return [{key: post[key] for key in DERIVED_KEYS} for post in preprocess_posts(posts)]
+
+
+def build_index(posts: list[dict], workers: int = 1) -> PostIndex:
+    """
+    Preprocess and index the corpus, parsing uncached posts across a process pool.
+
+    Posts whose derived forms are already cached are not parsed again. Only the
+    remaining posts are split into consecutive shards and preprocessed by the
+    workers, then the index is built in-process from the cached token counts.
+    Derived forms are stored on the given post dicts, like `preprocess_posts` does.
+
+    Workers are spawned rather than forked, the server calls this from a thread.
+
+    Args:
+        posts: Post dicts as returned by `ingest.load_posts`
+        workers: Number of worker processes, 1 preprocesses in the current process
+    """
+    missing = [post for post in posts if not apply_cached(post)]
+
+    workers = min(workers, math.ceil(len(missing) / MIN_SHARD_SIZE))
+    if workers > 1:
+        shard_size = math.ceil(len(missing) / workers)
+        shards = [missing[start:start + shard_size] for start in range(0, len(missing), shard_size)]
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+            for shard, derived_posts in zip(shards, pool.map(_preprocess_shard, shards)):
+                for post, derived in zip(shard, derived_posts):
+                    post.update(derived)
+        logger.info(f"Preprocessed {len(missing)} post(s) with {len(shards)} worker(s)")
+
+    return PostIndex(preprocess_posts(posts))
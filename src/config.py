@@ -45,7 +45,14 @@ def load_config(env: str = "dev"):
         "blog_base_url": os.getenv("BLOG_BASE_URL", "https://yourblog.com"),
         "server_name": os.getenv("SERVER_NAME", "Blog Search Server"),
         "log_level": os.getenv("LOG_LEVEL", "WARNING" if env == "production" else "INFO"),
-        "serpapi_key": os.getenv("SERPAPI_KEY", "your-serpapi-key")
+        "serpapi_key": os.getenv("SERPAPI_KEY", "your-serpapi-key"),
+        "blog_source_path": os.getenv("BLOG_SOURCE_PATH", ""),
+        "index_workers": os.getenv("INDEX_WORKERS", "1"),
+        "search_mode": os.getenv("SEARCH_MODE", "serpapi"),
+        "serpapi_deadline": os.getenv("SERPAPI_DEADLINE", "2.0"),
+        "profile_sample_rate": os.getenv("PROFILE_SAMPLE_RATE", "0"),
+        "profile_dir": os.getenv("PROFILE_DIR", "profiles"),
+        "profile_max_captures": os.getenv("PROFILE_MAX_CAPTURES", "100")
     }
     
     return config
@@ -58,6 +65,13 @@ BLOG_BASE_URL = CONFIG.get("blog_base_url", "https://yourblog.com")
 SERVER_NAME = CONFIG.get("server_name", "Blog Search Server")
 LOG_LEVEL = CONFIG.get("log_level", "INFO")
 SERPAPI_KEY = CONFIG.get("serpapi_key")
+BLOG_SOURCE_PATH = CONFIG.get("blog_source_path", "")
+INDEX_WORKERS = int(CONFIG.get("index_workers", "1") or 1)
+SEARCH_MODE = CONFIG.get("search_mode", "serpapi") or "serpapi"
+SERPAPI_DEADLINE = float(CONFIG.get("serpapi_deadline", "2.0") or 2.0)
+PROFILE_SAMPLE_RATE = float(CONFIG.get("profile_sample_rate", "0") or 0)
+PROFILE_DIR = CONFIG.get("profile_dir", "profiles") or "profiles"
+PROFILE_MAX_CAPTURES = int(CONFIG.get("profile_max_captures", "100") or 100)
 
 # Log token status
 if SERPAPI_KEY:
@@ -0,0 +1,223 @@
+import heapq
+import logging
+import math
+import re
+from bisect import bisect_left, bisect_right
+from collections import Counter
+from urllib.parse import urlparse
+
+from ingest import post_slug
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+TOKEN_PATTERN = re.compile(r"\w+")
+DATE_FORMAT_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}$")
+
+# BM25 parameters, title terms count as TITLE_WEIGHT occurrences
+BM25_K1 = 1.2
+BM25_B = 0.75
+TITLE_WEIGHT = 3
+RRF_K = 60
+
+
+def tokenize(text: str) -> list[str]:
+    """Split text into lowercase word tokens"""
+    return TOKEN_PATTERN.findall(text.lower())
+
+
+def bitmap_ids(bitmap: int) -> list[int]:
+    """Return the positions of the set bits of a bitmap, in ascending order"""
+    # Scan byte by byte, clearing bits of the whole bitmap would copy it for every id
+    ids = []
+    for byte_index, byte in enumerate(bitmap.to_bytes((bitmap.bit_length() + 7) // 8, 'little')):
+        while byte:
+            low_bit = byte & -byte
+            ids.append(byte_index * 8 + low_bit.bit_length() - 1)
+            byte ^= low_bit
+    return ids
+
+
+def ids_bitmap(ids: list[int]) -> int:
+    """Return the bitmap with the given positions set, built in one pass instead of one OR per id"""
+    if not ids:
+        return 0
+    bits = bytearray(max(ids) // 8 + 1)
+    for post_id in ids:
+        bits[post_id >> 3] |= 1 << (post_id & 7)
+    return int.from_bytes(bits, 'little')
+
+
+def reciprocal_rank_fusion(rankings: list[list[str]], k: int = RRF_K) -> list[str]:
+    """
+    Merge ranked lists of keys with reciprocal-rank fusion.
+
+    Every key scores `1 / (k + rank)` in each list it appears in. Keys present in
+    several lists are deduplicated and ties keep first-seen order.
+    """
+    scores = {}
+    for ranking in rankings:
+        for rank, key in enumerate(ranking, start=1):
+            scores[key] = scores.get(key, 0) + 1 / (k + rank)
+    return sorted(scores, key=lambda key: -scores[key])
+
+
+class PostIndex:
+    """
+    In-process index over preprocessed posts.
+
+    Every post is identified by its position in the corpus. Tags, languages and
+    terms map to integer bitmaps of those positions so filters combine with plain
+    `&`, and dates are kept as a sorted array for range lookups with bisect.
+    Per-post term counts are kept for BM25 ranking.
+    """
+
+    def __init__(self, posts: list[dict]):
+        self.posts = posts
+        self.all_posts = (1 << len(posts)) - 1
+        self.tag_bitmaps = {}
+        self.lang_bitmaps = {}
+        self.term_bitmaps = {}
+        self.term_counts = []
+        self.lengths = []
+        self.slugs = {}
+
+        # Post ids are collected per key first, every bitmap is then built once
+        tag_ids, lang_ids, term_ids = {}, {}, {}
+        dated = []
+        for post_id, post in enumerate(posts):
+            # Posts are found by their dateless slug, as in blog URLs, and by their unique slug
+            for slug in {post_slug(post["path"]) if post.get("path") else None, post.get("slug")} - {None}:
+                self.slugs.setdefault(slug, []).append(post_id)
+            metadata = post.get("metadata", {})
+
+            for tag in metadata.get("tags", []):
+                tag_ids.setdefault(tag, []).append(post_id)
+            if metadata.get("lang"):
+                lang_ids.setdefault(metadata["lang"], []).append(post_id)
+            if metadata.get("date"):
+                dated.append((metadata["date"], post_id))
+
+            # Token counts are a cached derived form, only tokenize posts without them
+            counts = Counter(post["terms"]) if "terms" in post else Counter(tokenize(post.get("text", "")))
+            for term in tokenize(post["title"]):
+                counts[term] += TITLE_WEIGHT
+            self.term_counts.append(counts)
+            self.lengths.append(sum(counts.values()))
+
+            for term in counts:
+                term_ids.setdefault(term, []).append(post_id)
+
+        self.tag_bitmaps = {tag: ids_bitmap(ids) for tag, ids in tag_ids.items()}
+        self.lang_bitmaps = {lang: ids_bitmap(ids) for lang, ids in lang_ids.items()}
+        self.term_bitmaps = {term: ids_bitmap(ids) for term, ids in term_ids.items()}
+
+        dated.sort()
+        self.dates = [date for date, _ in dated]
+        self.date_ids = [post_id for _, post_id in dated]
+
+    def post_for_url(self, url: str) -> dict | None:
+        """
+        Return the post published at a blog URL, matched on the last path segment (the slug).
+
+        When several posts share the slug, the one whose date appears in the URL
+        (`2019/12/31` or `2019-12-31`) is returned, or None if that does not decide.
+        """
+        slug = url.rstrip('/').rsplit('/', 1)[-1].removesuffix('.html')
+        post_ids = self.slugs.get(slug, [])
+        if len(post_ids) > 1:
+            path = urlparse(url).path
+            dates = {post_id: self.posts[post_id].get("metadata", {}).get("date") or "" for post_id in post_ids}
+            post_ids = [post_id for post_id, date in dates.items()
+                        if date and (date in path or date.replace('-', '/') in path)]
+        return self.posts[post_ids[0]] if len(post_ids) == 1 else None
+
+    def facet_filter(self, tags=None, date_from=None, date_to=None, lang=None) -> int:
+        """
+        Return the bitmap of posts matching every given facet.
+
+        Args:
+            tags: Tags the post must all carry
+            date_from: Earliest post date, inclusive (YYYY-MM-DD)
+            date_to: Latest post date, inclusive (YYYY-MM-DD)
+            lang: Post language code (e.g. "en")
+
+        Raises:
+            ValueError: If a date is not in YYYY-MM-DD format
+        """
+        bitmap = self.all_posts
+
+        for tag in tags or []:
+            bitmap &= self.tag_bitmaps.get(tag.lower(), 0)
+
+        if lang:
+            bitmap &= self.lang_bitmaps.get(lang.lower(), 0)
+
+        if date_from or date_to:
+            for date in (date_from, date_to):
+                if date and not DATE_FORMAT_PATTERN.match(date):
+                    raise ValueError(f"Invalid date '{date}', expected YYYY-MM-DD")
+
+            start = bisect_left(self.dates, date_from) if date_from else 0
+            end = bisect_right(self.dates, date_to) if date_to else len(self.dates)
+            bitmap &= ids_bitmap(self.date_ids[start:end])
+
+        return bitmap
+
+    def match(self, query: str, bitmap: int | None = None) -> int:
+        """Return the bitmap of posts containing every query term, restricted to `bitmap` if given"""
+        result = self.all_posts if bitmap is None else bitmap
+        for term in set(tokenize(query)):
+            result &= self.term_bitmaps.get(term, 0)
+        return result
+
+    def rank(self, query: str, limit: int = 10, bitmap: int | None = None) -> list[tuple[int, float]]:
+        """
+        Rank the posts containing any query term with BM25, restricted to `bitmap` if given.
+
+        Returns:
+            Up to `limit` (post id, score) pairs, best first
+        """
+        terms = set(tokenize(query))
+        candidates = 0
+        for term in terms:
+            candidates |= self.term_bitmaps.get(term, 0)
+        if bitmap is not None:
+            candidates &= bitmap
+        if not candidates:
+            return []
+
+        average_length = sum(self.lengths) / len(self.lengths)
+        idf = {}
+        for term in terms:
+            posts_with_term = self.term_bitmaps.get(term, 0).bit_count()
+            idf[term] = math.log(1 + (len(self.posts) - posts_with_term + 0.5) / (posts_with_term + 0.5))
+
+        scores = []
+        for post_id in bitmap_ids(candidates):
+            counts = self.term_counts[post_id]
+            norm = BM25_K1 * (1 - BM25_B + BM25_B * self.lengths[post_id] / average_length)
+            score = sum(idf[term] * counts[term] * (BM25_K1 + 1) / (counts[term] + norm)
+                        for term in terms if term in counts)
+            scores.append((post_id, score))
+
+        return heapq.nlargest(limit, scores, key=lambda item: item[1])
+
+    def covers(self, post_id: int, query: str) -> bool:
+        """Return True if the post contains every query term"""
+        return self.match(query, 1 << post_id) != 0
+
+    def search(self, query: str, limit: int = 10, **facets) -> list[dict]:
+        """
+        Return the best `limit` posts matching the facets, ranked with BM25 against the query.
+
+        Posts only need to contain one query term. Without query terms, the newest
+        posts matching the facets are returned.
+        """
+        bitmap = self.facet_filter(**facets)
+        if tokenize(query):
+            return [self.posts[post_id] for post_id, _ in self.rank(query, limit, bitmap)]
+
+        posts = [self.posts[post_id] for post_id in bitmap_ids(bitmap)]
+        return heapq.nlargest(limit, posts, key=lambda post: post.get("metadata", {}).get("date") or "")
@@ -0,0 +1,213 @@
+import logging
+import os
+import re
+import subprocess
+import tarfile
+import zipfile
+from urllib.parse import urlparse
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+ALL_POSTS_HEADING = "## All posts"
+POST_LINK_PATTERN = re.compile(r"\[(?P<title>[^\]]+)\]\((?P<url>https://[^)\s]+)\)")
+DATE_PREFIX_PATTERN = re.compile(r"^\d{4}-\d{2}-\d{2}-")
+
+
+def parse_llms_txt(content: str) -> list[dict]:
+    """
+    Extract the post entries listed in the "## All posts" section of llms.txt.
+
+    Args:
+        content: The raw llms.txt content
+
+    Returns:
+        A list of {"title", "url"} dicts, in the order they appear in the listing
+    """
+    entries = []
+    in_all_posts_section = False
+
+    for line in content.split('\n'):
+        stripped = line.strip()
+        if stripped == ALL_POSTS_HEADING:
+            in_all_posts_section = True
+            continue
+
+        # Stop at the next section, the listing is over
+        if in_all_posts_section and stripped.startswith("## "):
+            break
+
+        if in_all_posts_section:
+            match = POST_LINK_PATTERN.search(line)
+            if match:
+                entries.append({"title": match.group("title"), "url": match.group("url")})
+
+    return entries
+
+
+def raw_url_to_path(raw_url: str) -> str | None:
+    """
+    Map a raw GitHub URL to the file path inside the blog repository.
+
+    Both `owner/repo/<branch>/<path>` and `owner/repo/refs/heads/<branch>/<path>`
+    URLs are supported. URLs with empty, `.` or `..` path segments are rejected,
+    so a listing cannot point outside the repository.
+    """
+    parts = urlparse(raw_url).path.strip('/').split('/')[2:]
+    if parts[:1] == ["refs"]:
+        parts = parts[3:]
+    else:
+        parts = parts[1:]
+
+    if any(part in ("", ".", "..") for part in parts):
+        return None
+    return '/'.join(parts) or None
+
+
+def post_slug(path: str) -> str:
+    """Derive the post slug from its file path (e.g. `_posts/2024-01-15-python-tips.md` -> `python-tips`)"""
+    name = os.path.splitext(os.path.basename(path))[0]
+    return DATE_PREFIX_PATTERN.sub("", name)
+
+
+def unique_slugs(paths: list[str]) -> list[str]:
+    """
+    Return a slug per path, unique across the corpus.
+
+    Posts sharing a slug (e.g. a yearly `year-in-review`) keep their date prefix,
+    and a numeric suffix is added if even that is not unique.
+    """
+    slugs = [post_slug(path) for path in paths]
+    counts = {}
+    for slug in slugs:
+        counts[slug] = counts.get(slug, 0) + 1
+
+    seen = set()
+    unique = []
+    for path, slug in zip(paths, slugs):
+        if counts[slug] > 1:
+            slug = os.path.splitext(os.path.basename(path))[0]
+        candidate, number = slug, 2
+        while candidate in seen:
+            candidate, number = f"{slug}-{number}", number + 1
+        if candidate != post_slug(path):
+            logger.warning(f"Slug '{post_slug(path)}' is shared by several posts, using '{candidate}' for {path}")
+        seen.add(candidate)
+        unique.append(candidate)
+    return unique
+
+
+def _iter_checkout(source: str, paths):
+    """Yield (path, raw bytes) for the requested files found in a local checkout, ignoring paths leaving it"""
+    root = os.path.realpath(source)
+    for path in paths:
+        file_path = os.path.realpath(os.path.join(root, path))
+        if os.path.commonpath([root, file_path]) != root:
+            logger.warning(f"Ignoring {path}, it resolves outside {source}")
+            continue
+        if os.path.isfile(file_path):
+            with open(file_path, 'rb') as f:
+                yield path, f.read()
+
+
+def _archive_member_path(name: str, paths) -> str | None:
+    """Match an archive member to a repository path, ignoring a top-level folder (e.g. `blog-main/`)"""
+    name = name.removeprefix("./")
+    if name in paths:
+        return name
+    if '/' in name:
+        name = name.split('/', 1)[1]
+        if name in paths:
+            return name
+    return None
+
+
+def _iter_archive(source: str, paths):
+    """Yield (path, raw bytes) for the requested files in a tar or zip archive, in a single pass"""
+    if zipfile.is_zipfile(source):
+        with zipfile.ZipFile(source) as archive:
+            for info in archive.infolist():
+                path = _archive_member_path(info.filename, paths)
+                if path and not info.is_dir():
+                    yield path, archive.read(info)
+        return
+
+    # Stream mode reads the archive front to back without seeking
+    with tarfile.open(source, 'r|*') as archive:
+        for member in archive:
+            path = _archive_member_path(member.name, paths)
+            if path and member.isfile():
+                yield path, archive.extractfile(member).read()
+
+
+def load_posts(entries: list[dict], source: str) -> list[dict]:
+    """
+    Load the markdown of every llms.txt entry from a local checkout or archive of the blog repository.
+
+    Args:
+        entries: Post entries as returned by `parse_llms_txt`
+        source: Path to a git checkout directory or a .tar(.gz) / .zip archive
+
+    Returns:
+        A list of post dicts with "title", "url", "path", "slug" and "content",
+        in llms.txt order. Slugs are unique, see `unique_slugs`. Entries without a matching file, or whose file is
+        not valid UTF-8, are skipped.
+    """
+    by_path = {}
+    for entry in entries:
+        path = raw_url_to_path(entry["url"])
+        if path:
+            by_path[path] = entry
+
+    if os.path.isdir(source):
+        files = _iter_checkout(source, by_path)
+    else:
+        files = _iter_archive(source, by_path)
+
+    contents = dict(files)
+
+    posts = []
+    for path, entry in by_path.items():
+        if path not in contents:
+            logger.warning(f"No file found for '{entry['title']}' at {path}")
+            continue
+        try:
+            content = contents[path].decode('utf-8')
+        except UnicodeDecodeError as e:
+            logger.warning(f"Skipping '{entry['title']}', {path} is not valid UTF-8: {e}")
+            continue
+        posts.append({
+            "title": entry["title"],
+            "url": entry["url"],
+            "path": path,
+            "slug": None,
+            "content": content,
+        })
+
+    for post, slug in zip(posts, unique_slugs([post["path"] for post in posts])):
+        post["slug"] = slug
+
+    logger.info(f"Loaded {len(posts)} post(s) from {source}")
+    return posts
+
+
+def pull_checkout(source: str) -> bool:
+    """
+    Update a local git checkout with `git pull --ff-only`.
+
+    Returns:
+        True if the pull succeeded, False if the source is not a git checkout or the pull failed
+    """
+    if not os.path.isdir(os.path.join(source, ".git")):
+        return False
+
+    try:
+        subprocess.run(
+            ["git", "-C", source, "pull", "--ff-only", "--quiet"],
+            check=True, capture_output=True, timeout=60
+        )
+        return True
+    except (subprocess.SubprocessError, OSError) as e:
+        logger.warning(f"Could not pull {source}: {e}")
+        return False
@@ -0,0 +1,205 @@
+import hashlib
+import logging
+import re
+from collections import Counter
+from html.parser import HTMLParser
+
+import markdown
+
+from index import tokenize
+from snippets import split_passages
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+FRONT_MATTER_DELIMITER = "---"
+LIQUID_PATTERN = re.compile(r"{%.*?%}|{{.*?}}", re.DOTALL)
+DATE_PATTERN = re.compile(r"(\d{4}-\d{2}-\d{2})")
+HEADING_PATTERN = re.compile(r"^(#{1,6})\s+(.+?)\s*#*\s*$")
+BLOCK_TAGS = {"p", "h1", "h2", "h3", "h4", "h5", "h6", "li", "pre", "blockquote", "tr", "br", "hr", "div"}
+
+DERIVED_KEYS = ("hash", "metadata", "text", "outline", "word_count", "passages", "terms")
+
+# Derived forms keyed by content hash, shared by every post with the same body
+_derived_cache = {}
+
+
+def content_hash(content: str) -> str:
+    """Return the sha256 hex digest used to version a post body"""
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+
+def _parse_value(value: str):
+    """Parse a scalar or inline `[a, b]` list front-matter value"""
+    value = value.strip()
+    if value.startswith('[') and value.endswith(']'):
+        return [item.strip().strip('\'"') for item in value[1:-1].split(',') if item.strip()]
+    return value.strip('\'"')
+
+
+def parse_front_matter(content: str) -> tuple[dict, str]:
+    """
+    Split a post into its front matter and markdown body.
+
+    Only the subset of YAML used by blog front matter is supported:
+    `key: value` pairs, inline `[a, b]` lists and `- item` block lists.
+
+    Returns:
+        A (front matter dict, body) tuple. Posts without front matter return an empty dict.
+    """
+    lines = content.split('\n')
+    if not lines or lines[0].strip() != FRONT_MATTER_DELIMITER:
+        return {}, content
+
+    front_matter = {}
+    current_key = None
+    for index, line in enumerate(lines[1:], start=1):
+        if line.strip() == FRONT_MATTER_DELIMITER:
+            return front_matter, '\n'.join(lines[index + 1:])
+
+        stripped = line.strip()
+        if stripped.startswith('- ') and current_key:
+            if not isinstance(front_matter[current_key], list):
+                front_matter[current_key] = []
+            front_matter[current_key].append(_parse_value(stripped[2:]))
+        elif ':' in line and not line[0].isspace():
+            key, value = line.split(':', 1)
+            current_key = key.strip()
+            front_matter[current_key] = _parse_value(value)
+
+    # No closing delimiter, treat the whole post as body
+    return {}, content
+
+
+def normalize_metadata(front_matter: dict, path: str = "") -> dict:
+    """
+    Extract the date, tags and language used for filtering from raw front matter.
+
+    The date falls back to the `YYYY-MM-DD-` prefix of the post file name.
+    """
+    date_match = DATE_PATTERN.search(str(front_matter.get("date", ""))) or DATE_PATTERN.search(path)
+
+    tags = front_matter.get("tags") or []
+    if isinstance(tags, str):
+        tags = tags.replace(',', ' ').split()
+
+    lang = front_matter.get("lang") or front_matter.get("language") or None
+
+    return {
+        "date": date_match.group(1) if date_match else None,
+        "tags": sorted({tag.lower() for tag in tags if tag}),
+        "lang": lang.lower() if lang else None,
+    }
+
+
+class _TextExtractor(HTMLParser):
+    """Collect the text of rendered markdown, one line per block element"""
+
+    def __init__(self):
+        super().__init__()
+        self.parts = []
+
+    def handle_data(self, data):
+        self.parts.append(data)
+
+    def handle_endtag(self, tag):
+        if tag in BLOCK_TAGS:
+            self.parts.append('\n')
+
+    def handle_startendtag(self, tag, attrs):
+        if tag in BLOCK_TAGS:
+            self.parts.append('\n')
+
+
+def markdown_to_text(body: str) -> str:
+    """Render a markdown body to plain text with one block (paragraph, heading, item) per line"""
+    extractor = _TextExtractor()
+    extractor.feed(markdown.markdown(LIQUID_PATTERN.sub('', body)))
+    extractor.close()
+
+    lines = (' '.join(line.split()) for line in ''.join(extractor.parts).split('\n'))
+    return '\n'.join(line for line in lines if line)
+
+
+def heading_outline(body: str) -> list[dict]:
+    """Return the `#` headings of a markdown body as {"level", "title"} dicts, ignoring code blocks"""
+    outline = []
+    in_code_block = False
+    for line in body.split('\n'):
+        if line.lstrip().startswith(('```', '~~~')):
+            in_code_block = not in_code_block
+            continue
+
+        match = None if in_code_block else HEADING_PATTERN.match(line)
+        if match:
+            outline.append({"level": len(match.group(1)), "title": match.group(2)})
+
+    return outline
+
+
+def preprocess(content: str, path: str = "") -> dict:
+    """
+    Parse a post once into its derived forms, reusing the cached result for identical content.
+
+    Returns:
+        A dict with "hash", "metadata", "text", "outline", "word_count", "passages"
+        and "terms", the token counts of the text used for indexing
+    """
+    digest = content_hash(content)
+    cached = _derived_cache.get(digest)
+    if cached is not None and cached["path"] == path:
+        return cached["derived"]
+
+    front_matter, body = parse_front_matter(content)
+    text = markdown_to_text(body)
+    derived = {
+        "hash": digest,
+        "metadata": {**front_matter, **normalize_metadata(front_matter, path)},
+        "text": text,
+        "outline": heading_outline(body),
+        "word_count": len(text.split()),
+        "passages": split_passages(text),
+        "terms": dict(Counter(tokenize(text))),
+    }
+
+    _derived_cache[digest] = {"path": path, "derived": derived}
+    return derived
+
+
+def apply_cached(post: dict) -> bool:
+    """Attach cached derived forms to a post without parsing it, returning False on a cache miss"""
+    cached = _derived_cache.get(content_hash(post["content"]))
+    if cached is None or cached["path"] != post.get("path", ""):
+        return False
+    post.update(cached["derived"])
+    return True
+
+
+def preprocess_post(post: dict) -> dict:
+    """
+    Store the derived forms next to the raw body of a post dict.
+
+    Derivatives are only recomputed when the content hash of the body changed.
+    Derivatives computed elsewhere (e.g. in a worker process) are added to the cache.
+    """
+    digest = content_hash(post["content"])
+    if post.get("hash") != digest:
+        post.update(preprocess(post["content"], post.get("path", "")))
+    elif digest not in _derived_cache:
+        derived = {key: post[key] for key in DERIVED_KEYS}
+        _derived_cache[digest] = {"path": post.get("path", ""), "derived": derived}
+    return post
+
+
+def preprocess_posts(posts: list[dict]) -> list[dict]:
+    """Preprocess every post and drop cached derivatives of bodies that are no longer in the corpus"""
+    for post in posts:
+        preprocess_post(post)
+
+    live = {post["hash"] for post in posts}
+    for digest in list(_derived_cache):
+        if digest not in live:
+            del _derived_cache[digest]
+
+    return posts
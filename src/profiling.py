@@ -0,0 +1,117 @@
+import cProfile
+import functools
+import logging
+import os
+import random
+import threading
+import time
+import tracemalloc
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+SLOWEST_CALLS = 20
+TOP_ALLOCATIONS = 10
+SUMMARY_FILE = "summary.txt"
+
+
+class Profiler:
+    """
+    Sample calls with cProfile and tracemalloc and keep the captures in a rotating directory.
+
+    For every sampled call a `<timestamp>-<name>.prof` file (readable with `pstats`)
+    and a `.mem.txt` file with the top allocations are written. Only the newest
+    `max_captures` calls are kept, and `summary.txt` lists the slowest calls still on disk.
+
+    cProfile and tracemalloc are process-wide, so only one call is captured at a time.
+    Calls nested in a captured call, or running concurrently, are not sampled.
+    """
+
+    def __init__(self, sample_rate: float = 0.0, directory: str = "profiles", max_captures: int = 100):
+        self.sample_rate = sample_rate
+        self.directory = directory
+        self.max_captures = max_captures
+        self.captures = []
+        self._lock = threading.Lock()
+
+    def profiled(self, name: str):
+        """Decorator sampling calls of the wrapped function under `name`"""
+        def decorator(fn):
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                if self.sample_rate <= 0 or random.random() >= self.sample_rate:
+                    return fn(*args, **kwargs)
+                if not self._lock.acquire(blocking=False):
+                    return fn(*args, **kwargs)
+                try:
+                    return self._capture(name, fn, args, kwargs)
+                finally:
+                    self._lock.release()
+            return wrapper
+        return decorator
+
+    def _capture(self, name: str, fn, args, kwargs):
+        """Run one call under cProfile and tracemalloc and write the capture"""
+        profile = cProfile.Profile()
+        tracing = tracemalloc.is_tracing()
+        if not tracing:
+            tracemalloc.start()
+        tracemalloc.reset_peak()
+        start = time.perf_counter()
+
+        try:
+            profile.enable()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                profile.disable()
+        finally:
+            elapsed = time.perf_counter() - start
+            _, peak = tracemalloc.get_traced_memory()
+            snapshot = tracemalloc.take_snapshot()
+            if not tracing:
+                tracemalloc.stop()
+
+            try:
+                self._write(name, elapsed, peak, profile, snapshot)
+            except OSError as e:
+                logger.warning(f"Could not write profile for {name}: {e}")
+
+    def _rotate(self):
+        """Delete the oldest captures on disk, including those of previous runs, beyond `max_captures`"""
+        captures = sorted(entry.name[:-len(".prof")] for entry in os.scandir(self.directory)
+                          if entry.name.endswith(".prof"))
+        for base in captures[:-self.max_captures]:
+            for suffix in (".prof", ".mem.txt"):
+                path = os.path.join(self.directory, base + suffix)
+                if os.path.exists(path):
+                    os.remove(path)
+
+        live = set(captures[-self.max_captures:])
+        self.captures = [capture for capture in self.captures if os.path.basename(capture["base"]) in live]
+
+    def _write(self, name: str, elapsed: float, peak: int, profile: cProfile.Profile, snapshot):
+        """Write the profile and allocation files, rotate old captures and refresh the summary"""
+        os.makedirs(self.directory, exist_ok=True)
+        now = time.time()
+        timestamp = f"{time.strftime('%Y%m%dT%H%M%S', time.localtime(now))}.{int(now * 10**6) % 10**6:06d}"
+        base = os.path.join(self.directory, f"{timestamp}-{name}")
+
+        profile.dump_stats(f"{base}.prof")
+        with open(f"{base}.mem.txt", 'w') as f:
+            f.write(f"{name}: {elapsed * 1000:.1f} ms, peak {peak / 1024:.1f} KiB\n\n")
+            for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]:
+                f.write(f"{stat}\n")
+
+        self.captures.append({"name": name, "seconds": elapsed, "peak": peak, "base": base})
+        self._rotate()
+
+        slowest = sorted(self.captures, key=lambda capture: capture["seconds"], reverse=True)[:SLOWEST_CALLS]
+        with open(os.path.join(self.directory, SUMMARY_FILE), 'w') as f:
+            f.write(f"Slowest of the last {len(self.captures)} sampled call(s)\n\n")
+            for capture in slowest:
+                f.write(
+                    f"{capture['seconds'] * 1000:10.1f} ms  {capture['peak'] / 1024:10.1f} KiB  "
+                    f"{capture['name']:<20} {os.path.basename(capture['base'])}.prof\n"
+                )
@@ -0,0 +1,146 @@
+import logging
+from weakref import WeakKeyDictionary
+
+from mcp import types
+from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp.resources import FunctionResource
+from mcp.server.lowlevel.server import NotificationOptions
+from pydantic import AnyUrl
+
+from preprocess import content_hash
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+INDEX_URI = "blog://index"
+POST_URI_TEMPLATE = "blog://post/{slug}"
+MARKDOWN_MIME_TYPE = "text/markdown"
+
+
+class ResourceRegistry:
+    """
+    Keep the MCP resources for the llms.txt listing and every post in sync with the corpus.
+
+    Each resource carries the sha256 of its content as `version` in its metadata,
+    so clients can tell whether their cached copy is still current. Clients can
+    subscribe to resources to be sent `resources/updated` when they change.
+    """
+
+    def __init__(self, server: FastMCP):
+        self.server = server
+        self.resources = {}
+        # Resource URIs each client session subscribed to, dropped with the session
+        self.subscriptions = WeakKeyDictionary()
+        self._enable_notifications()
+
+    def _enable_notifications(self):
+        """Handle resources/subscribe and advertise `subscribe` and `listChanged` to clients"""
+        lowlevel = self.server._mcp_server
+
+        @lowlevel.subscribe_resource()
+        async def subscribe(uri: AnyUrl):
+            self.subscriptions.setdefault(lowlevel.request_context.session, set()).add(str(uri))
+
+        @lowlevel.unsubscribe_resource()
+        async def unsubscribe(uri: AnyUrl):
+            self.subscriptions.get(lowlevel.request_context.session, set()).discard(str(uri))
+
+        # FastMCP runs with default notification options and the low-level server
+        # always reports subscribe=False, so amend the advertised capabilities
+        get_capabilities = lowlevel.get_capabilities
+
+        def capabilities(notification_options: NotificationOptions, experimental_capabilities: dict):
+            options = NotificationOptions(
+                prompts_changed=notification_options.prompts_changed,
+                resources_changed=True,
+                tools_changed=notification_options.tools_changed,
+            )
+            result = get_capabilities(options, experimental_capabilities)
+            result.resources = types.ResourcesCapability(subscribe=True, listChanged=True)
+            return result
+
+        lowlevel.get_capabilities = capabilities
+
+    def _register(self, uri: str, content: str, name: str, title: str, description: str) -> bool:
+        """Register or update a resource, returning True if its version changed"""
+        version = content_hash(content)
+        resource = self.resources.get(uri)
+
+        if resource is None:
+            resource = FunctionResource(
+                uri=uri,
+                name=name,
+                title=title,
+                description=description,
+                mime_type=MARKDOWN_MIME_TYPE,
+                fn=lambda: content,
+                meta={"version": version},
+            )
+            self.server.add_resource(resource)
+            self.resources[uri] = resource
+            return True
+
+        if resource.meta.get("version") == version:
+            return False
+
+        resource.fn = lambda: content
+        resource.meta = {"version": version}
+        return True
+
+    def sync(self, posts: list[dict], llms_txt: str) -> tuple[list[str], bool]:
+        """
+        Register the index and post resources, updating versions and dropping removed posts.
+
+        Returns:
+            A (URIs of existing resources whose content changed, whether the resource list changed) tuple
+        """
+        previous = set(self.resources)
+        changed = []
+
+        if self._register(INDEX_URI, llms_txt, "index", "llms.txt", "Listing of every blog post"):
+            changed.append(INDEX_URI)
+
+        current = {INDEX_URI}
+        for post in posts:
+            uri = POST_URI_TEMPLATE.format(slug=post["slug"])
+            current.add(uri)
+            if self._register(uri, post["content"], post["slug"], post["title"], f"Markdown of '{post['title']}'"):
+                changed.append(uri)
+
+        removed = previous - current
+        for uri in removed:
+            # FastMCP has no public API to unregister a resource
+            self.server._resource_manager._resources.pop(uri, None)
+            del self.resources[uri]
+            for uris in self.subscriptions.values():
+                uris.discard(uri)
+
+        added = current - previous
+        updated = [uri for uri in changed if uri not in added]
+        logger.info(f"Resources synced: {len(added)} added, {len(updated)} updated, {len(removed)} removed")
+        return updated, bool(added or removed)
+
+    async def notify(self, updated: list[str], list_changed: bool, session=None):
+        """
+        Notify client sessions about a sync.
+
+        `resources/updated` goes to every session subscribed to a changed URI, and
+        `resources/list_changed` to every subscribed session plus `session`, the one
+        that triggered the sync. Sessions that fail to receive a notification are dropped.
+        """
+        sessions = list(self.subscriptions)
+        if session is not None and session not in self.subscriptions:
+            sessions.append(session)
+
+        for client in sessions:
+            subscribed = self.subscriptions.get(client, set())
+            try:
+                for uri in updated:
+                    if uri in subscribed:
+                        await client.send_resource_updated(AnyUrl(uri))
+                if list_changed:
+                    await client.send_resource_list_changed()
+            except Exception as e:
+                logger.warning(f"Could not notify a client session, dropping it: {e}")
+                self.subscriptions.pop(client, None)
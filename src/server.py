@@ -1,8 +1,23 @@
+import asyncio
 import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
 import requests
-from mcp.server.fastmcp import FastMCP
+from mcp.server.fastmcp import Context, FastMCP
 from serpapi import GoogleSearch
-from config import SERVER_NAME, BLOG_BASE_URL, SERPAPI_KEY
+from config import (
+    SERVER_NAME, BLOG_BASE_URL, SERPAPI_KEY, BLOG_SOURCE_PATH, INDEX_WORKERS, SEARCH_MODE, SERPAPI_DEADLINE,
+    PROFILE_SAMPLE_RATE, PROFILE_DIR, PROFILE_MAX_CAPTURES
+)
+from ingest import parse_llms_txt, load_posts, pull_checkout
+from index import PostIndex, reciprocal_rank_fusion
+from build import build_index
+from preprocess import content_hash
+from snippets import make_snippet
+from suggest import Suggester
+from resources import ResourceRegistry, POST_URI_TEMPLATE
+from profiling import Profiler
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -10,9 +25,112 @@ logger = logging.getLogger(__name__)
 
 # Create the MCP server
 mcp = FastMCP(name=SERVER_NAME)
+_resources = ResourceRegistry(mcp)
+# Opt-in cProfile/tracemalloc sampling, disabled unless profile_sample_rate > 0
+profiler = Profiler(PROFILE_SAMPLE_RATE, PROFILE_DIR, PROFILE_MAX_CAPTURES)
+
+# Posts loaded from the local blog source and their index, filled on first use
+_corpus = None
+_index = None
+# Title completions built from the llms.txt listing, filled on first use
+_suggester = None
+# Requests per post title, kept across suggester rebuilds to rank suggestions
+_title_hits = {}
+# Content hash of the llms.txt the suggester was built from and when it was last checked
+_suggester_hash = None
+_suggester_checked_at = 0.0
+# Most posts returned by a local or hybrid search
+SEARCH_RESULTS = 10
+SERPAPI_WORKERS = 4
+# Seconds before `suggest` re-checks llms.txt when there is no local blog source
+SUGGESTER_TTL = 300
+
+# Runs SerpAPI requests in hybrid mode so they can be abandoned at the deadline.
+# Submissions beyond the free workers are dropped rather than queued.
+_serpapi_executor = ThreadPoolExecutor(max_workers=SERPAPI_WORKERS, thread_name_prefix="serpapi")
+_serpapi_slots = threading.BoundedSemaphore(SERPAPI_WORKERS)
+
+
+@profiler.profiled("fetch_llms_txt")
+def fetch_llms_txt() -> str:
+    """Fetch the llms.txt listing from the blog"""
+    response = requests.get(f"{BLOG_BASE_URL}/llms.txt", timeout=10)
+    response.raise_for_status()
+    return response.text
+
+
+@profiler.profiled("fetch_raw_post")
+def fetch_raw_post(raw_url: str) -> str:
+    """Fetch the raw markdown of a post from GitHub"""
+    response = requests.get(raw_url, timeout=10)
+    response.raise_for_status()
+    return response.text
+
+
+@profiler.profiled("load_corpus")
+def _load_corpus() -> tuple[list[str], bool]:
+    """
+    Load, preprocess and index the posts from the local blog source and sync their MCP resources.
+
+    Returns:
+        The URIs of resources whose content changed and whether the resource list changed
+    """
+    global _corpus, _index
+    llms_txt = fetch_llms_txt()
+    entries = parse_llms_txt(llms_txt)
+    posts = load_posts(entries, BLOG_SOURCE_PATH)
+    _index = build_index(posts, INDEX_WORKERS)
+    _corpus = posts
+    _update_suggester(llms_txt, entries)
+    return _resources.sync(_corpus, llms_txt)
+
+
+def get_corpus() -> list[dict]:
+    """Return the preprocessed posts from the local blog source, loading them on first use"""
+    if _corpus is None:
+        _load_corpus()
+    return _corpus
+
+
+def get_index() -> PostIndex:
+    """Return the index over the local posts, building it on first use"""
+    global _index
+    if _index is None:
+        # Loading the corpus builds the index, only index posts loaded some other way
+        posts = get_corpus()
+        if _index is None:
+            _index = PostIndex(posts)
+    return _index
+
+
+def _update_suggester(llms_txt: str, entries: list[dict] | None = None):
+    """Rebuild the title suggester if the llms.txt listing changed since it was built"""
+    global _suggester, _suggester_hash, _suggester_checked_at
+    digest = content_hash(llms_txt)
+    if _suggester is None or digest != _suggester_hash:
+        _suggester = Suggester(entries if entries is not None else parse_llms_txt(llms_txt), _title_hits)
+        _suggester_hash = digest
+    _suggester_checked_at = time.monotonic()
+
+
+def get_suggester() -> Suggester:
+    """
+    Return the title suggester for the llms.txt listing, building it on first use.
+
+    With a local blog source it follows the corpus, reloaded by `refresh_posts`.
+    Without one, llms.txt is fetched again once the suggester is `SUGGESTER_TTL` seconds old.
+    """
+    if BLOG_SOURCE_PATH:
+        if _suggester is None:
+            # Loading the corpus builds the suggester from the same llms.txt fetch
+            get_corpus()
+    elif _suggester is None or time.monotonic() - _suggester_checked_at > SUGGESTER_TTL:
+        _update_suggester(fetch_llms_txt())
+    return _suggester
 
 
 @mcp.tool()
+@profiler.profiled("get_post_content")
 def get_post_content(title: str) -> str:
     """
     Get the full content of a blog post by title.
@@ -24,13 +142,21 @@ def get_post_content(title: str) -> str:
         The full markdown content of the blog post
     """
     try:
+        # Serve from the local blog source when one is configured
+        if BLOG_SOURCE_PATH:
+            for post in get_corpus():
+                if title in post["title"]:
+                    _record_hit(post["title"])
+                    return post["content"]
+            return f"Post with title '{title}' not found in llm.txt"
+
         # Fetch the llms.txt content from the blog
-        llm_url = f"{BLOG_BASE_URL}/llms.txt"
-        response = requests.get(llm_url, timeout=10)
-        response.raise_for_status()
+        content = fetch_llms_txt()
+        if _suggester is not None:
+            # Offer posts added since the suggester was built
+            _update_suggester(content)
 
         # Parse the llm.txt content to find the post by title
-        content = response.text
         lines = content.split('\n')
 
         # Find the "## All posts" section and extract posts from there
@@ -48,45 +174,273 @@ def get_post_content(title: str) -> str:
                 # Extract URL from markdown link format: [title](url)
                 if '](https://' in line:
                     raw_url = line.split('](')[1].strip(')')
+                    _record_hit(line.split('](')[0].split('[', 1)[-1])
                     break
 
         if not raw_url:
             return f"Post with title '{title}' not found in llm.txt"
 
         # Fetch the raw markdown content from GitHub
-        content_response = requests.get(raw_url, timeout=10)
-        content_response.raise_for_status()
+        return fetch_raw_post(raw_url)
+
+    except requests.RequestException as e:
+        return f"Error fetching content: {str(e)}"
+    except Exception as e:
+        return f"Error processing content: {str(e)}"
 
-        return content_response.text
 
+def _record_hit(title: str):
+    """Count a post request towards its suggestion popularity"""
+    if _suggester is not None:
+        _suggester.record_hit(title)
+    else:
+        _title_hits[title] = _title_hits.get(title, 0) + 1
+
+
+@mcp.tool()
+def suggest(prefix: str, limit: int = 10) -> str:
+    """
+    Suggest exact post titles and common title terms starting with a prefix.
+
+    Use this to find the exact title to pass to `get_post_content`.
+
+    Args:
+        prefix: The beginning of a title or of any word in it (e.g. "travel dia")
+        limit: Maximum number of suggestions to return
+    """
+    try:
+        suggestions = get_suggester().suggest(prefix, limit)
     except requests.RequestException as e:
         return f"Error fetching content: {str(e)}"
     except Exception as e:
         return f"Error processing content: {str(e)}"
 
+    if not suggestions:
+        return f"No suggestions for '{prefix}'."
+
+    result = f"Suggestions for '{prefix}':\n\n"
+    for completion, kind in suggestions:
+        result += f"- {completion} ({kind})\n"
+    return result
+
 
 @mcp.tool()
-def search_posts(query: str) -> str:
-    """Search through blog posts for content matching the query."""
+async def search_posts(
+    query: str,
+    tags: list[str] | None = None,
+    date_from: str | None = None,
+    date_to: str | None = None,
+    lang: str | None = None,
+) -> str:
+    """
+    Search through blog posts for content matching the query.
+
+    Args:
+        query: Free text to search for
+        tags: Only return posts carrying all of these tags
+        date_from: Only return posts published on or after this date (YYYY-MM-DD)
+        date_to: Only return posts published on or before this date (YYYY-MM-DD)
+        lang: Only return posts written in this language (e.g. "en")
+    """
+    # Searches wait on SerpAPI and the local index, keep them off the event loop
+    return await asyncio.to_thread(_search_posts, query, tags, date_from, date_to, lang)
+
+
+@profiler.profiled("search_posts")
+def _search_posts(query: str, tags: list[str] | None, date_from: str | None, date_to: str | None,
+                  lang: str | None) -> str:
+    """Run a search in a worker thread, see `search_posts`"""
+    if tags or date_from or date_to or lang:
+        return _search_local(query, tags=tags, date_from=date_from, date_to=date_to, lang=lang)
+
+    if SEARCH_MODE == "hybrid" and BLOG_SOURCE_PATH:
+        return _search_hybrid(query)
+
+    posts = _serpapi_results(query)
+    if posts:
+        result = f"Found {len(posts)} post(s) matching '{query}':\n\n"
+        for post in posts:
+            title = post.get("title")
+            url = post.get("link")
+            snippet = _local_snippet(url, query) or post.get("snippet")
+            result += f"**{title}**\n{url}\n{snippet}\n\n"
+        return result
+
+    return f"No posts found matching '{query}'."
+
+
+@profiler.profiled("serpapi")
+def _serpapi_results(query: str, timeout: float | None = None) -> list[dict]:
+    """
+    Return the organic SerpAPI results for a site search, or an empty list if the search failed.
+
+    `timeout` bounds the HTTP request in seconds, instead of the client's default.
+    """
     search = GoogleSearch({
         "q": f"site:{BLOG_BASE_URL.strip('https://')} {query}", 
         "api_key": SERPAPI_KEY
     })
+    if timeout is not None:
+        search.timeout = timeout
     search_result = search.get_dict()
 
     if search_result.get("search_metadata").get("status") == "Success":
-        posts = search_result.get("organic_results", [])
-        if posts:
-            result = f"Found {len(posts)} post(s) matching '{query}':\n\n"
-            for post in posts:
-                title = post.get("title")
-                url = post.get("link")
-                snippet = post.get("snippet")
-                result += f"**{title}**\n{url}\n{snippet}\n\n"
-            return result
+        return search_result.get("organic_results", [])
+    return []
 
-    return f"No posts found matching '{query}'."
+
+def _search_hybrid(query: str) -> str:
+    """
+    Answer from the local index, asking SerpAPI only when the local results look weak.
+
+    Local results are confident when the best one contains every query term. Otherwise
+    SerpAPI is queried in the background while local snippets are built. It gets at most
+    `SERPAPI_DEADLINE` seconds from submission, snippet time included, and both rankings
+    are merged with reciprocal-rank fusion.
+    When every SerpAPI worker is still busy the local results are returned alone.
+    """
+    try:
+        index = get_index()
+        ranked = index.rank(query, SEARCH_RESULTS)
+    except Exception as e:
+        logger.warning(f"Local search failed, falling back to SerpAPI: {e}")
+        index, ranked = None, []
+
+    future = None
+    if not ranked or not index.covers(ranked[0][0], query):
+        if _serpapi_slots.acquire(blocking=False):
+            # The request timeout frees the worker soon after the caller stops waiting
+            future = _serpapi_executor.submit(_serpapi_results, query, SERPAPI_DEADLINE)
+            future.add_done_callback(lambda _: _serpapi_slots.release())
+            submitted = time.monotonic()
+        else:
+            logger.warning("All SerpAPI workers are busy, using local results only")
+
+    # Results keyed by the local post URL when known, so both sources deduplicate
+    results = {}
+    local_keys = []
+    for post_id, _ in ranked:
+        post = index.posts[post_id]
+        results[post["url"]] = {"title": post["title"], "url": post["url"], "snippet": make_snippet(post, query)}
+        local_keys.append(post["url"])
+
+    remote_keys = []
+    if future is not None:
+        try:
+            remaining = SERPAPI_DEADLINE - (time.monotonic() - submitted)
+            remote = future.result(timeout=max(0.0, remaining))
+        except FutureTimeoutError:
+            logger.warning(f"SerpAPI did not answer within {SERPAPI_DEADLINE}s, using local results only")
+            remote = []
+        except Exception as e:
+            logger.warning(f"SerpAPI search failed, using local results only: {e}")
+            remote = []
+
+        for item in remote:
+            link = item.get("link")
+            post = index.post_for_url(link) if index and link else None
+            key = post["url"] if post else link
+            if key in results:
+                # Prefer the public blog URL over the raw GitHub one
+                results[key]["url"] = link
+            else:
+                results[key] = {"title": item.get("title"), "url": link, "snippet": item.get("snippet")}
+            remote_keys.append(key)
+
+    if not results:
+        return f"No posts found matching '{query}'."
+
+    keys = reciprocal_rank_fusion([local_keys, remote_keys])[:SEARCH_RESULTS]
+    result = f"Found {len(keys)} post(s) matching '{query}':\n\n"
+    for key in keys:
+        entry = results[key]
+        result += f"**{entry['title']}**\n{entry['url']}\n{entry['snippet'] or ''}\n\n"
+    return result
+
+
+def _local_snippet(url: str, query: str) -> str | None:
+    """Build a highlighted snippet from the local copy of the post at `url`, if there is one"""
+    if not BLOG_SOURCE_PATH or not url:
+        return None
+
+    try:
+        post = get_index().post_for_url(url)
+    except Exception as e:
+        logger.warning(f"Could not build local snippet: {e}")
+        return None
+
+    return make_snippet(post, query) if post else None
+
+
+def _search_local(query: str, **facets) -> str:
+    """Answer a filtered search from the local index without calling SerpAPI, best `SEARCH_RESULTS` first"""
+    if not BLOG_SOURCE_PATH:
+        return "Filtering by tags, date or language requires a local blog source, set blog_source_path to enable it."
+
+    try:
+        posts = get_index().search(query, SEARCH_RESULTS, **facets)
+    except ValueError as e:
+        return f"Invalid filter: {str(e)}"
+    except requests.RequestException as e:
+        return f"Error fetching content: {str(e)}"
+    except Exception as e:
+        return f"Error processing content: {str(e)}"
+
+    if not posts:
+        return f"No posts found matching '{query}'."
+
+    result = f"Found {len(posts)} post(s) matching '{query}':\n\n"
+    for post in posts:
+        metadata = post.get("metadata", {})
+        details = ", ".join(filter(None, [metadata.get("date"), ", ".join(metadata.get("tags", []))]))
+        snippet = make_snippet(post, query) or ""
+        result += f"**{post['title']}**\n{post['url']}\n{details}\n{snippet}\n\n"
+    return result
+
+
+@mcp.resource(POST_URI_TEMPLATE, mime_type="text/markdown")
+def read_post(slug: str) -> str:
+    """Raw markdown of a blog post, by slug (e.g. `python-tips`)"""
+    if not BLOG_SOURCE_PATH:
+        raise ValueError("No local blog source configured, set blog_source_path to enable post resources.")
+
+    for post in get_corpus():
+        if post["slug"] == slug:
+            return post["content"]
+    raise ValueError(f"Post '{slug}' not found")
+
+
+@mcp.tool()
+async def refresh_posts(ctx: Context | None = None) -> str:
+    """
+    Reload all posts from the local blog source.
+
+    A git checkout is updated with `git pull` first, archives are simply re-read.
+    Subscribed clients are notified about every resource whose content changed.
+    """
+    if not BLOG_SOURCE_PATH:
+        return "No local blog source configured, set blog_source_path to enable bulk ingest."
+
+    try:
+        pulled = await asyncio.to_thread(pull_checkout, BLOG_SOURCE_PATH)
+        updated, list_changed = await asyncio.to_thread(_load_corpus)
+    except requests.RequestException as e:
+        return f"Error fetching content: {str(e)}"
+    except Exception as e:
+        return f"Error processing content: {str(e)}"
+
+    await _resources.notify(updated, list_changed, ctx.session if ctx is not None else None)
+
+    source = "pulled checkout" if pulled else BLOG_SOURCE_PATH
+    return f"Loaded {len(_corpus)} post(s) from {source}, {len(updated)} resource(s) changed"
 
 
 if __name__ == "__main__":
-    mcp.run(transport="stdio")
\ No newline at end of file
+    # Load the local posts up front so their resources are listed from the start
+    if BLOG_SOURCE_PATH:
+        try:
+            get_corpus()
+        except Exception as e:
+            logger.warning(f"Could not load posts from {BLOG_SOURCE_PATH}: {e}")
+
+    mcp.run(transport="stdio")
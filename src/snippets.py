@@ -0,0 +1,109 @@
+import logging
+import re
+
+from index import tokenize
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+PASSAGE_WORDS = 40
+SNIPPET_CHARS = 240
+MAX_PASSAGES_SCORED = 200
+ELLIPSIS = "…"
+
+
+def split_passages(text: str, passage_words: int = PASSAGE_WORDS) -> list[tuple[int, int]]:
+    """
+    Split plain text into passages of roughly `passage_words` words.
+
+    Consecutive short blocks (one per line) are grouped together and long blocks are
+    cut at word boundaries.
+
+    Returns:
+        A list of (start, end) character offsets into `text`
+    """
+    passages = []
+    start = None
+    words = 0
+    for match in re.finditer(r"\S+", text):
+        if start is None:
+            start = match.start()
+        words += 1
+        end = match.end()
+
+        at_block_end = end == len(text) or text[end] == '\n'
+        if words >= passage_words or (at_block_end and words >= passage_words // 2):
+            passages.append((start, end))
+            start = None
+            words = 0
+
+    if start is not None:
+        passages.append((start, len(text.rstrip())))
+
+    return passages
+
+
+def _score_passage(passage: str, terms: set[str]) -> tuple[int, int]:
+    """Score a passage by distinct query terms matched, then by total occurrences"""
+    tokens = tokenize(passage)
+    matched = terms.intersection(tokens)
+    return len(matched), sum(1 for token in tokens if token in matched)
+
+
+def highlight(text: str, terms: set[str]) -> str:
+    """Wrap every whole-word occurrence of the query terms in markdown bold"""
+    if not terms:
+        return text
+    pattern = re.compile(r"\b(" + "|".join(re.escape(term) for term in sorted(terms, key=len, reverse=True)) + r")\b",
+                         re.IGNORECASE)
+    return pattern.sub(r"**\1**", text)
+
+
+def _window(passage: str, terms: set[str], max_chars: int) -> str:
+    """Cut a passage down to `max_chars` around its first query term, at word boundaries"""
+    if len(passage) <= max_chars:
+        return passage
+
+    hits = [match.start() for match in (re.search(rf"\b{re.escape(term)}\b", passage, re.IGNORECASE) for term in terms)
+            if match]
+    start = max(0, min(min(hits, default=0) - max_chars // 4, len(passage) - max_chars))
+    end = start + max_chars
+
+    # Move the cut points to the nearest word boundaries inside the window
+    if start > 0:
+        space = passage.find(' ', start, end)
+        if space != -1:
+            start = space + 1
+    if end < len(passage):
+        space = passage.rfind(' ', start, end)
+        if space > start:
+            end = space
+
+    window = passage[start:end].strip()
+    return f"{ELLIPSIS if start > 0 else ''}{window}{ELLIPSIS if end < len(passage) else ''}"
+
+
+def make_snippet(post: dict, query: str, max_chars: int = SNIPPET_CHARS) -> str | None:
+    """
+    Build a highlighted snippet for a preprocessed post from its best passage.
+
+    At most `MAX_PASSAGES_SCORED` precomputed passages are scored, so the cost per
+    result is bounded regardless of the post length.
+
+    Returns:
+        The snippet, or None if no passage contains a query term
+    """
+    terms = set(tokenize(query))
+    text = post.get("text", "")
+
+    best, best_score = None, (0, 0)
+    for start, end in post.get("passages", [])[:MAX_PASSAGES_SCORED]:
+        score = _score_passage(text[start:end], terms)
+        if score > best_score:
+            best, best_score = text[start:end], score
+
+    if best is None:
+        return None
+
+    return highlight(_window(best.replace('\n', ' '), terms, max_chars), terms)
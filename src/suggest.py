@@ -0,0 +1,140 @@
+import heapq
+import logging
+import threading
+from bisect import bisect_left
+
+from index import tokenize
+
+# Configure logging
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+MIN_TERM_LENGTH = 3
+MIN_TERM_POSTS = 2
+
+
+class Suggester:
+    """
+    Prefix completion over post titles and frequent title terms.
+
+    Completions are kept in a sorted array of lowercase keys and looked up with
+    bisect. Every title is also keyed from each of its words, so "travel" completes
+    "Creating a Travel Diary With Django". Titles are ranked by how often they were
+    requested, terms by the number of titles they appear in, and both are interleaved.
+
+    A segment tree over the sorted keys holds the best rank below every node, so the
+    top completions of a prefix are found best-first without scanning every key that
+    starts with it. Hits update the tree in place.
+
+    Hit counts live in the `hits` dict, pass the same dict to a rebuilt suggester
+    to keep the popularity of titles across listing refreshes.
+    """
+
+    def __init__(self, entries: list[dict], hits: dict | None = None):
+        self.hits = {} if hits is None else hits
+        self._lock = threading.Lock()
+        keys = []
+
+        term_posts = {}
+        for entry in entries:
+            title = entry["title"]
+            words = title.lower().split()
+            for position in range(len(words)):
+                keys.append((' '.join(words[position:]), title, "post"))
+
+            for term in set(tokenize(title)):
+                if len(term) >= MIN_TERM_LENGTH:
+                    term_posts[term] = term_posts.get(term, 0) + 1
+
+        self.term_posts = {term: count for term, count in term_posts.items() if count >= MIN_TERM_POSTS}
+        keys.extend((term, term, "term") for term in self.term_posts)
+
+        keys.sort()
+        self.keys = [key for key, _, _ in keys]
+        self.completions = [(completion, kind) for _, completion, kind in keys]
+
+        # Alphabetical order of the completions breaks ties between equally popular ones
+        self.ordinals = {completion: ordinal for ordinal, completion in enumerate(sorted(set(self.completions)))}
+        self.positions = {}
+        for position, (completion, kind) in enumerate(self.completions):
+            if kind == "post":
+                self.positions.setdefault(completion, []).append(position)
+
+        self.size = 1
+        while self.size < len(self.keys):
+            self.size *= 2
+        # Slots past the last key rank worse than any completion
+        self.empty_rank = 2 * len(self.ordinals)
+        self.tree = [self.empty_rank] * (2 * self.size)
+        for position, completion in enumerate(self.completions):
+            self.tree[self.size + position] = self._rank(*completion)
+        for node in range(self.size - 1, 0, -1):
+            self.tree[node] = min(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def record_hit(self, title: str):
+        """Count a request for a title, raising its rank in future suggestions"""
+        with self._lock:
+            self.hits[title] = self.hits.get(title, 0) + 1
+            rank = self._rank(title, "post")
+            for position in self.positions.get(title, []):
+                node = self.size + position
+                self.tree[node] = rank
+                while node > 1:
+                    node //= 2
+                    self.tree[node] = min(self.tree[2 * node], self.tree[2 * node + 1])
+
+    def _rank(self, completion: str, kind: str) -> int:
+        """
+        Sort key putting the most popular first, posts before terms on ties, then alphabetical.
+
+        The three criteria are packed into one integer, which compares faster than a tuple.
+        """
+        if kind == "post":
+            popularity, kind_order = self.hits.get(completion, 0), 0
+        else:
+            popularity, kind_order = self.term_posts[completion], 1
+        return (kind_order - 2 * popularity) * len(self.ordinals) + self.ordinals[(completion, kind)]
+
+    def suggest(self, prefix: str, limit: int = 10) -> list[tuple[str, str]]:
+        """
+        Return the top `limit` (completion, kind) pairs whose key starts with `prefix`.
+
+        Kind is "post" for a full post title and "term" for a frequent title word.
+        """
+        prefix = ' '.join(prefix.lower().split())
+        if not prefix or limit <= 0:
+            return []
+
+        start = bisect_left(self.keys, prefix)
+        end = bisect_left(self.keys, prefix + '\U0010ffff', start)
+
+        # Seed the search with the tree nodes exactly covering [start, end)
+        heap = []
+        low, high = start + self.size, end + self.size
+        while low < high:
+            if low & 1:
+                heap.append((self.tree[low], low))
+                low += 1
+            if high & 1:
+                high -= 1
+                heap.append((self.tree[high], high))
+            low //= 2
+            high //= 2
+        heapq.heapify(heap)
+
+        # A node's rank is the best rank below it, so leaves come out best first
+        results = []
+        seen = set()
+        while heap and len(results) < limit:
+            rank, node = heapq.heappop(heap)
+            if node >= self.size:
+                completion = self.completions[node - self.size]
+                if completion not in seen:
+                    seen.add(completion)
+                    results.append(completion)
+                continue
+            for child in (2 * node, 2 * node + 1):
+                if self.tree[child] != self.empty_rank:
+                    heapq.heappush(heap, (self.tree[child], child))
+
+        return results
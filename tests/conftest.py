@@ -69,4 +69,36 @@ def mock_serpapi_no_results():
 @pytest.fixture
 def mock_llms_txt_content():
     """Mock llms.txt content for testing."""
-    return load_fixture('llms_txt_content.json')['content']
\ No newline at end of file
+    return load_fixture('llms_txt_content.json')['content']
+
+@pytest.fixture
+def blog_checkout(tmp_path):
+    """Local checkout of the blog repository with the fixture posts under _posts/."""
+    posts_dir = tmp_path / "blog" / "_posts"
+    posts_dir.mkdir(parents=True)
+    for post in load_fixture('blog_posts.json'):
+        (posts_dir / post['name']).write_text(post['content'], encoding='utf-8')
+    return str(tmp_path / "blog")
+
+
+@pytest.fixture
+def mock_posts():
+    """Preprocessed post dicts as produced by bulk ingest of the fixture posts."""
+    import preprocess
+
+    llms_entries = {
+        'python-tips': 'Python Tips and Tricks',
+        'web-development': 'Getting Started with Web Development',
+        'data-science-intro': 'Introduction to Data Science',
+    }
+    posts = []
+    for post in load_fixture('blog_posts.json'):
+        slug = post['name'][len('2024-01-15-'):-len('.md')]
+        posts.append({
+            'title': llms_entries[slug],
+            'url': f"https://raw.githubusercontent.com/jtemporal/jtemporal.github.io/refs/heads/main/_posts/{post['name']}",
+            'path': f"_posts/{post['name']}",
+            'slug': slug,
+            'content': post['content'],
+        })
+    return preprocess.preprocess_posts(posts)
@@ -0,0 +1,88 @@
+"""
+Tests for the build.py module
+"""
+import sys
+import os
+from unittest.mock import patch
+
+import pytest
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+def _raw_posts(posts):
+    """Strip the derived forms, leaving posts as ingest returns them."""
+    return [{key: post[key] for key in ('title', 'url', 'path', 'slug', 'content')} for post in posts]
+
+
+class TestBuildIndex:
+    """Test cases for sharded, process-pool index construction."""
+
+    def test_parallel_build_matches_sequential(self, mock_posts):
+        """Test that preprocessing in worker processes gives the same index as a single pass."""
+        import preprocess
+        from build import build_index
+
+        sequential = build_index(_raw_posts(mock_posts), workers=1)
+
+        preprocess._derived_cache.clear()
+        posts = _raw_posts(mock_posts)
+        with patch('build.MIN_SHARD_SIZE', 1):
+            parallel = build_index(posts, workers=2)
+
+        assert parallel.posts is posts
+        assert posts[0]['metadata']['tags'] == ['programming', 'python', 'tips']
+        assert parallel.term_bitmaps == sequential.term_bitmaps
+        assert parallel.tag_bitmaps == sequential.tag_bitmaps
+        assert parallel.lang_bitmaps == sequential.lang_bitmaps
+        assert parallel.slugs == sequential.slugs
+        assert parallel.dates == sequential.dates
+        assert parallel.date_ids == sequential.date_ids
+        assert set(preprocess._derived_cache) == {post['hash'] for post in posts}
+
+    def test_only_uncached_posts_go_to_workers(self, mock_posts):
+        """Test that a rebuild sends only changed posts to the pool, and workers are spawned."""
+        import preprocess
+        from build import build_index
+
+        build_index(_raw_posts(mock_posts))
+        posts = _raw_posts(mock_posts)
+        for post in posts[1:]:
+            post['content'] += '\nA new paragraph.\n'
+
+        with patch('build.MIN_SHARD_SIZE', 1), patch('build.ProcessPoolExecutor') as mock_pool:
+            pool = mock_pool.return_value.__enter__.return_value
+            pool.map.side_effect = lambda fn, shards: [fn(shard) for shard in shards]
+            build_index(posts, workers=4)
+
+        assert mock_pool.call_args.kwargs['mp_context'].get_start_method() == 'spawn'
+        shards = pool.map.call_args[0][1]
+        assert [post['slug'] for shard in shards for post in shard] == ['web-development', 'data-science-intro']
+        assert 'A new paragraph' in posts[1]['text']
+        assert set(preprocess._derived_cache) == {post['hash'] for post in posts}
+
+    def test_small_corpus_builds_in_process(self, mock_posts):
+        """Test that corpora smaller than a shard do not start a pool."""
+        from build import build_index
+
+        with patch('build.ProcessPoolExecutor') as mock_pool:
+            index = build_index(_raw_posts(mock_posts), workers=8)
+
+        mock_pool.assert_not_called()
+        assert len(index.posts) == 3
+
+    def test_cached_posts_are_not_reparsed(self, mock_posts):
+        """Test that posts with cached derivatives skip markdown parsing."""
+        from build import build_index
+
+        build_index(_raw_posts(mock_posts))
+
+        with patch('preprocess.markdown_to_text') as mock_text:
+            build_index(_raw_posts(mock_posts))
+
+        mock_text.assert_not_called()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,140 @@
+"""
+Tests for the index.py module
+"""
+import sys
+import os
+
+import pytest
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+class TestPostIndex:
+    """Test cases for the facet and term bitmaps of the local index."""
+
+    def test_tokenize(self):
+        """Test that text is split into lowercase word tokens."""
+        from index import tokenize
+
+        assert tokenize("Python's list-comprehensions, 2024!") == ['python', 's', 'list', 'comprehensions', '2024']
+
+    def test_bitmap_ids(self):
+        """Test converting a bitmap to the ascending list of set positions."""
+        from index import bitmap_ids
+
+        assert bitmap_ids(0b101001) == [0, 3, 5]
+
+    def test_ids_bitmap(self):
+        """Test building a bitmap from positions, the inverse of bitmap_ids."""
+        from index import bitmap_ids, ids_bitmap
+
+        assert ids_bitmap([]) == 0
+        assert ids_bitmap([0, 3, 5]) == 0b101001
+        assert bitmap_ids(ids_bitmap([1, 8, 9, 1000])) == [1, 8, 9, 1000]
+        assert bitmap_ids(0) == []
+
+    def test_facet_filter_by_tags(self, mock_posts):
+        """Test that every requested tag must be present."""
+        from index import PostIndex, bitmap_ids
+
+        index = PostIndex(mock_posts)
+
+        assert bitmap_ids(index.facet_filter(tags=['python'])) == [0, 2]
+        assert bitmap_ids(index.facet_filter(tags=['Python', 'pandas'])) == [2]
+        assert index.facet_filter(tags=['rust']) == 0
+
+    def test_facet_filter_by_date_range(self, mock_posts):
+        """Test inclusive date ranges and open ended bounds."""
+        from index import PostIndex, bitmap_ids
+
+        index = PostIndex(mock_posts)
+
+        assert bitmap_ids(index.facet_filter(date_from='2024-01-10')) == [0, 1]
+        assert bitmap_ids(index.facet_filter(date_to='2024-01-10')) == [1, 2]
+        assert bitmap_ids(index.facet_filter(date_from='2024-01-06', date_to='2024-01-14')) == [1]
+
+    def test_facet_filter_invalid_date(self, mock_posts):
+        """Test that malformed dates are rejected."""
+        from index import PostIndex
+
+        with pytest.raises(ValueError):
+            PostIndex(mock_posts).facet_filter(date_from='January 2024')
+
+    def test_facet_filter_combines_lang(self, mock_posts):
+        """Test that language and tag facets are intersected."""
+        from index import PostIndex, bitmap_ids
+
+        index = PostIndex(mock_posts)
+
+        assert bitmap_ids(index.facet_filter(lang='PT')) == [2]
+        assert bitmap_ids(index.facet_filter(tags=['python'], lang='en')) == [0]
+
+    def test_search_ranks_within_facets(self, mock_posts):
+        """Test that the filtered posts are ranked with BM25 and need only one query term."""
+        from index import PostIndex
+
+        index = PostIndex(mock_posts)
+
+        assert [p['slug'] for p in index.search('python', tags=['python'])] == ['python-tips', 'data-science-intro']
+        assert [p['slug'] for p in index.search('pandas numpy', lang='pt')] == ['data-science-intro']
+        assert [p['slug'] for p in index.search('pandas tutorial', lang='pt')] == ['data-science-intro']
+        assert index.search('django', tags=['python']) == []
+
+    def test_search_limit(self, mock_posts):
+        """Test that results are cut at the limit, newest first when there are no query terms."""
+        from index import PostIndex
+
+        index = PostIndex(mock_posts)
+
+        assert len(index.search('python', limit=1, tags=['python'])) == 1
+        assert [p['slug'] for p in index.search('', limit=2)] == ['python-tips', 'web-development']
+
+    def test_post_for_url(self, mock_posts):
+        """Test finding the local post behind a blog URL, using the date when slugs collide."""
+        import preprocess
+        from index import PostIndex
+
+        reviews = preprocess.preprocess_posts([
+            {'title': f'{year} in review', 'url': '', 'path': f'_posts/{year}-12-31-year-in-review.md',
+             'slug': f'{year}-12-31-year-in-review', 'content': f'---\ndate: {year}-12-31\n---\n\nThe year {year}.'}
+            for year in (2019, 2020)
+        ])
+        index = PostIndex(mock_posts + reviews)
+
+        assert index.post_for_url('https://jtemporal.com/python-tips/')['slug'] == 'python-tips'
+        assert index.post_for_url('https://jtemporal.com/2020/12/31/year-in-review/')['title'] == '2020 in review'
+        assert index.post_for_url('https://jtemporal.com/2019-12-31-year-in-review.html')['title'] == '2019 in review'
+        assert index.post_for_url('https://jtemporal.com/year-in-review/') is None
+        assert index.post_for_url('https://jtemporal.com/missing/') is None
+
+    def test_rank_bm25(self, mock_posts):
+        """Test that posts are ranked by BM25 with title terms boosted."""
+        from index import PostIndex
+
+        index = PostIndex(mock_posts)
+        ranked = index.rank('python data')
+
+        assert [post_id for post_id, _ in ranked] == [2, 0]
+        assert ranked[0][1] > ranked[1][1]
+        assert index.rank('kubernetes') == []
+
+    def test_covers(self, mock_posts):
+        """Test checking that a post contains every query term."""
+        from index import PostIndex
+
+        index = PostIndex(mock_posts)
+
+        assert index.covers(2, 'pandas numpy')
+        assert not index.covers(0, 'pandas numpy')
+
+    def test_reciprocal_rank_fusion(self):
+        """Test that keys found in several rankings are deduplicated and boosted."""
+        from index import reciprocal_rank_fusion
+
+        assert reciprocal_rank_fusion([['a', 'b', 'c'], ['c', 'd']]) == ['c', 'a', 'b', 'd']
+        assert reciprocal_rank_fusion([[], ['x']]) == ['x']
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
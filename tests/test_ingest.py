@@ -0,0 +1,148 @@
+"""
+Tests for the ingest.py module
+"""
+import sys
+import os
+import tarfile
+import zipfile
+from unittest.mock import patch
+
+import pytest
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+class TestIngestModule:
+    """Test cases for bulk ingest from a local blog source."""
+
+    def test_parse_llms_txt_only_all_posts_section(self, mock_llms_txt_content):
+        """Test that only the entries under "## All posts" are returned."""
+        from ingest import parse_llms_txt
+
+        entries = parse_llms_txt(mock_llms_txt_content)
+
+        assert [e['title'] for e in entries] == [
+            'Python Tips and Tricks',
+            'Getting Started with Web Development',
+            'Introduction to Data Science',
+        ]
+        assert entries[0]['url'].endswith('_posts/2024-01-15-python-tips.md')
+
+    def test_raw_url_to_path(self):
+        """Test mapping raw GitHub URLs with and without refs/heads to repository paths."""
+        from ingest import raw_url_to_path
+
+        assert raw_url_to_path(
+            'https://raw.githubusercontent.com/jtemporal/jtemporal.github.io/refs/heads/main/_posts/a.md'
+        ) == '_posts/a.md'
+        assert raw_url_to_path(
+            'https://raw.githubusercontent.com/jtemporal/jtemporal.github.io/main/_posts/a.md'
+        ) == '_posts/a.md'
+
+    def test_raw_url_to_path_rejects_traversal(self):
+        """Test that URLs escaping the repository with `..` segments are not mapped to a path."""
+        from ingest import raw_url_to_path
+
+        assert raw_url_to_path(
+            'https://raw.githubusercontent.com/o/r/main/../../../../etc/passwd'
+        ) is None
+        assert raw_url_to_path('https://raw.githubusercontent.com/o/r/main/_posts/./a.md') is None
+
+    def test_post_slug(self):
+        """Test that the date prefix and extension are dropped from the slug."""
+        from ingest import post_slug
+
+        assert post_slug('_posts/2024-01-15-python-tips.md') == 'python-tips'
+        assert post_slug('_posts/about.md') == 'about'
+
+    def test_unique_slugs(self):
+        """Test that posts sharing a slug keep their date prefix."""
+        from ingest import unique_slugs
+
+        assert unique_slugs([
+            '_posts/2019-12-31-year-in-review.md',
+            '_posts/2020-12-31-year-in-review.md',
+            '_posts/2020-01-01-python-tips.md',
+            'drafts/2020-01-01-python-tips.md',
+        ]) == ['2019-12-31-year-in-review', '2020-12-31-year-in-review', '2020-01-01-python-tips',
+               '2020-01-01-python-tips-2']
+
+    def test_load_posts_from_checkout(self, mock_llms_txt_content, blog_checkout, mock_blog_posts):
+        """Test loading every listed post from a local checkout."""
+        from ingest import parse_llms_txt, load_posts
+
+        posts = load_posts(parse_llms_txt(mock_llms_txt_content), blog_checkout)
+
+        assert len(posts) == 3
+        assert posts[0]['title'] == 'Python Tips and Tricks'
+        assert posts[0]['slug'] == 'python-tips'
+        assert posts[0]['content'] == mock_blog_posts[0]['content']
+
+    def test_load_posts_skips_missing_files(self, mock_llms_txt_content, blog_checkout):
+        """Test that entries without a file in the checkout are skipped."""
+        from ingest import parse_llms_txt, load_posts
+
+        os.remove(os.path.join(blog_checkout, '_posts', '2024-01-10-web-development.md'))
+        posts = load_posts(parse_llms_txt(mock_llms_txt_content), blog_checkout)
+
+        assert [p['slug'] for p in posts] == ['python-tips', 'data-science-intro']
+
+    def test_load_posts_skips_invalid_utf8(self, mock_llms_txt_content, blog_checkout):
+        """Test that a post that is not valid UTF-8 is skipped instead of aborting the load."""
+        from ingest import parse_llms_txt, load_posts
+
+        with open(os.path.join(blog_checkout, '_posts', '2024-01-10-web-development.md'), 'wb') as f:
+            f.write(b'caf\xe9 latin-1 post')
+        posts = load_posts(parse_llms_txt(mock_llms_txt_content), blog_checkout)
+
+        assert [p['slug'] for p in posts] == ['python-tips', 'data-science-intro']
+
+    def test_load_posts_ignores_symlinks_outside_checkout(self, blog_checkout, tmp_path):
+        """Test that a post file symlinked outside the checkout is not read."""
+        from ingest import load_posts
+
+        secret = tmp_path / 'secret.txt'
+        secret.write_text('secret')
+        os.symlink(secret, os.path.join(blog_checkout, '_posts', 'leak.md'))
+        entries = [{'title': 'Leak', 'url': 'https://raw.githubusercontent.com/o/r/main/_posts/leak.md'}]
+
+        assert load_posts(entries, blog_checkout) == []
+
+    def test_load_posts_from_tarball(self, mock_llms_txt_content, blog_checkout, tmp_path):
+        """Test loading posts from a GitHub-style tarball with a top-level folder."""
+        from ingest import parse_llms_txt, load_posts
+
+        archive_path = str(tmp_path / 'blog.tar.gz')
+        with tarfile.open(archive_path, 'w:gz') as archive:
+            archive.add(blog_checkout, arcname='blog-main')
+
+        posts = load_posts(parse_llms_txt(mock_llms_txt_content), archive_path)
+
+        assert len(posts) == 3
+        assert 'Python tips and tricks' in posts[0]['content']
+
+    def test_load_posts_from_zip(self, mock_llms_txt_content, mock_blog_posts, tmp_path):
+        """Test loading posts from a zip archive."""
+        from ingest import parse_llms_txt, load_posts
+
+        archive_path = str(tmp_path / 'blog.zip')
+        with zipfile.ZipFile(archive_path, 'w') as archive:
+            for post in mock_blog_posts:
+                archive.writestr(f"blog-main/_posts/{post['name']}", post['content'])
+
+        posts = load_posts(parse_llms_txt(mock_llms_txt_content), archive_path)
+
+        assert [p['slug'] for p in posts] == ['python-tips', 'web-development', 'data-science-intro']
+
+    def test_pull_checkout_not_a_git_repo(self, blog_checkout):
+        """Test that pulling a plain directory is a no-op."""
+        from ingest import pull_checkout
+
+        with patch('ingest.subprocess.run') as mock_run:
+            assert pull_checkout(blog_checkout) is False
+            mock_run.assert_not_called()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
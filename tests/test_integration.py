@@ -5,6 +5,7 @@ These tests make real API calls to SerpApi and GitHub (for content) and should b
 Run with: pytest tests/test_integration.py -v -m integration
 """
 
+import asyncio
 import sys
 import os
 import pytest
@@ -30,7 +31,7 @@ class TestIntegration:
                 pytest.skip("No valid SerpApi key configured")
             
             # This makes a real API call to SerpApi
-            result = search_posts('python')
+            result = asyncio.run(search_posts('python'))
             
             # Basic validation
             assert isinstance(result, str), "search_posts should return a string"
@@ -60,7 +61,7 @@ class TestIntegration:
             print("\n🔍 Testing search with real SerpApi data")
             
             # Try a common search term
-            result = search_posts('tutorial')  # Common word likely to appear in blog posts
+            result = asyncio.run(search_posts('tutorial'))  # Common word likely to appear in blog posts
             
             assert isinstance(result, str), "search_posts should return a string"
             assert len(result) > 0, "Search result should not be empty"
@@ -159,7 +160,7 @@ def main():
     # Test 1: Search posts via SerpApi
     print("1. Searching for 'python' via SerpApi:")
     try:
-        results = search_posts('python')
+        results = asyncio.run(search_posts('python'))
         print(results[:500] + "..." if len(results) > 500 else results)
     except Exception as e:
         print(f"Error: {e}")
@@ -167,7 +168,7 @@ def main():
     # Test 2: Search posts with different term
     print("\n2. Searching for 'tutorial':")
     try:
-        results = search_posts('tutorial')
+        results = asyncio.run(search_posts('tutorial'))
         print(results[:500] + "..." if len(results) > 500 else results)
     except Exception as e:
         print(f"Error: {e}")
@@ -0,0 +1,118 @@
+"""
+Tests for the preprocess.py module
+"""
+import sys
+import os
+from unittest.mock import patch
+
+import pytest
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+SAMPLE_POST = """---
+title: 'Python Tips and Tricks'
+layout: post
+date: 2024-01-01T04:00:00.000+00:00
+lang: EN
+tags:
+- python
+- Tutorial
+---
+
+# Python Tips and Tricks
+
+Here are some **useful** Python tips.
+
+## List comprehensions
+
+```python
+# not a heading
+squares = [x * x for x in range(10)]
+```
+
+{% include image.html %}
+
+- Short
+- Readable
+"""
+
+
+class TestPreprocessModule:
+    """Test cases for the post preprocessing pipeline."""
+
+    def test_parse_front_matter_block_list(self):
+        """Test parsing scalars and block lists from front matter."""
+        from preprocess import parse_front_matter
+
+        front_matter, body = parse_front_matter(SAMPLE_POST)
+
+        assert front_matter['title'] == 'Python Tips and Tricks'
+        assert front_matter['layout'] == 'post'
+        assert front_matter['tags'] == ['python', 'Tutorial']
+        assert body.lstrip().startswith('# Python Tips and Tricks')
+
+    def test_parse_front_matter_missing(self):
+        """Test that posts without front matter are returned untouched."""
+        from preprocess import parse_front_matter
+
+        assert parse_front_matter('# Just a heading') == ({}, '# Just a heading')
+
+    def test_normalize_metadata_comma_tags_and_path_date(self):
+        """Test comma separated tags and the file name date fallback."""
+        from preprocess import normalize_metadata
+
+        metadata = normalize_metadata({'tags': 'python, programming'}, '_posts/2024-01-15-python-tips.md')
+
+        assert metadata == {'date': '2024-01-15', 'tags': ['programming', 'python'], 'lang': None}
+
+    def test_preprocess_derived_forms(self):
+        """Test the metadata, plain text, outline and word count of a post."""
+        from preprocess import preprocess
+
+        derived = preprocess(SAMPLE_POST)
+
+        assert derived['metadata']['date'] == '2024-01-01'
+        assert derived['metadata']['tags'] == ['python', 'tutorial']
+        assert derived['metadata']['lang'] == 'en'
+        assert derived['outline'] == [
+            {'level': 1, 'title': 'Python Tips and Tricks'},
+            {'level': 2, 'title': 'List comprehensions'},
+        ]
+        assert 'Here are some useful Python tips.' in derived['text'].split('\n')
+        assert '**' not in derived['text']
+        assert 'include image.html' not in derived['text']
+        assert derived['word_count'] == len(derived['text'].split())
+
+    def test_preprocess_post_invalidated_by_content_hash(self):
+        """Test that derivatives are only recomputed when the body changes."""
+        from preprocess import preprocess_post
+
+        post = {'content': SAMPLE_POST, 'path': '_posts/2024-01-01-python-tips.md'}
+        preprocess_post(post)
+        first_hash = post['hash']
+
+        with patch('preprocess.markdown_to_text') as mock_text:
+            preprocess_post(post)
+            mock_text.assert_not_called()
+
+        post['content'] = SAMPLE_POST + '\nOne more paragraph.\n'
+        preprocess_post(post)
+
+        assert post['hash'] != first_hash
+        assert 'One more paragraph.' in post['text']
+
+    def test_preprocess_posts_prunes_stale_cache(self, mock_blog_posts):
+        """Test that cached derivatives of removed bodies are dropped."""
+        import preprocess
+
+        posts = [{'content': p['content'], 'path': f"_posts/{p['name']}"} for p in mock_blog_posts]
+        preprocess.preprocess_posts(posts)
+        preprocess.preprocess_posts(posts[:1])
+
+        assert set(preprocess._derived_cache) == {posts[0]['hash']}
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
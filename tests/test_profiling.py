@@ -0,0 +1,87 @@
+"""
+Tests for the profiling.py module
+"""
+import sys
+import os
+import pstats
+
+import pytest
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+class TestProfiler:
+    """Test cases for sampled cProfile/tracemalloc captures."""
+
+    def test_disabled_by_default(self, tmp_path):
+        """Test that nothing is captured with a zero sample rate."""
+        from profiling import Profiler
+
+        profiler = Profiler(directory=str(tmp_path / 'profiles'))
+        double = profiler.profiled('double')(lambda x: x * 2)
+
+        assert double(21) == 42
+        assert not (tmp_path / 'profiles').exists()
+
+    def test_capture_writes_profile_and_summary(self, tmp_path):
+        """Test that a sampled call writes a readable profile, allocations and a summary."""
+        from profiling import Profiler
+
+        profiler = Profiler(sample_rate=1.0, directory=str(tmp_path))
+
+        @profiler.profiled('build_list')
+        def build_list(size):
+            """Build a list."""
+            return list(range(size))
+
+        assert build_list(1000) == list(range(1000))
+        assert build_list.__doc__ == 'Build a list.'
+
+        prof_files = list(tmp_path.glob('*-build_list.prof'))
+        assert len(prof_files) == 1
+        pstats.Stats(str(prof_files[0]))
+        assert 'peak' in prof_files[0].with_suffix('.mem.txt').read_text()
+        assert 'build_list' in (tmp_path / 'summary.txt').read_text()
+
+    def test_nested_calls_are_not_captured(self, tmp_path):
+        """Test that only the outermost sampled call is captured."""
+        from profiling import Profiler
+
+        profiler = Profiler(sample_rate=1.0, directory=str(tmp_path))
+        inner = profiler.profiled('inner')(lambda: 'inner')
+        outer = profiler.profiled('outer')(lambda: inner())
+
+        assert outer() == 'inner'
+        assert [capture['name'] for capture in profiler.captures] == ['outer']
+
+    def test_rotation_keeps_newest_captures(self, tmp_path):
+        """Test that old captures are deleted beyond the limit."""
+        from profiling import Profiler
+
+        profiler = Profiler(sample_rate=1.0, directory=str(tmp_path), max_captures=2)
+        noop = profiler.profiled('noop')(lambda: None)
+        for _ in range(4):
+            noop()
+
+        assert len(list(tmp_path.glob('*.prof'))) == 2
+        assert len(list(tmp_path.glob('*.mem.txt'))) == 2
+        assert len(profiler.captures) == 2
+
+    def test_exceptions_are_captured_and_reraised(self, tmp_path):
+        """Test that failing calls are still profiled."""
+        from profiling import Profiler
+
+        profiler = Profiler(sample_rate=1.0, directory=str(tmp_path))
+
+        @profiler.profiled('boom')
+        def boom():
+            raise RuntimeError('boom')
+
+        with pytest.raises(RuntimeError):
+            boom()
+        assert len(list(tmp_path.glob('*-boom.prof'))) == 1
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
@@ -0,0 +1,143 @@
+"""
+Tests for the resources.py module
+"""
+import asyncio
+import sys
+import os
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+class TestResourceRegistry:
+    """Test cases for the versioned post and index resources."""
+
+    @pytest.fixture
+    def server(self):
+        from mcp.server.fastmcp import FastMCP
+        return FastMCP(name="Test Blog Search Server")
+
+    def test_sync_registers_versioned_resources(self, server, mock_posts, mock_llms_txt_content):
+        """Test that the index and every post are listed with their content hash."""
+        from resources import ResourceRegistry
+
+        updated, list_changed = ResourceRegistry(server).sync(mock_posts, mock_llms_txt_content)
+        resources = {str(r.uri): r for r in asyncio.run(server.list_resources())}
+
+        assert updated == []
+        assert list_changed is True
+        assert set(resources) == {
+            'blog://index',
+            'blog://post/python-tips',
+            'blog://post/web-development',
+            'blog://post/data-science-intro',
+        }
+        assert resources['blog://post/python-tips'].meta == {'version': mock_posts[0]['hash']}
+
+    def test_sync_reports_updated_content(self, server, mock_posts, mock_llms_txt_content):
+        """Test that a changed post gets a new version and its content is served."""
+        from resources import ResourceRegistry
+
+        registry = ResourceRegistry(server)
+        registry.sync(mock_posts, mock_llms_txt_content)
+
+        changed_post = {**mock_posts[1], 'content': 'Rewritten post'}
+        updated, list_changed = registry.sync([mock_posts[0], changed_post, mock_posts[2]], mock_llms_txt_content)
+        contents = asyncio.run(server.read_resource('blog://post/web-development'))
+
+        assert updated == ['blog://post/web-development']
+        assert list_changed is False
+        assert list(contents)[0].content == 'Rewritten post'
+
+    def test_sync_with_colliding_slugs_is_stable(self, server, blog_checkout, mock_llms_txt_content):
+        """Test that posts sharing a dateless slug get distinct resources and unchanged posts are not reported."""
+        from ingest import load_posts
+        from resources import ResourceRegistry
+
+        entries = []
+        for year in (2019, 2020):
+            name = f'{year}-12-31-year-in-review.md'
+            with open(os.path.join(blog_checkout, '_posts', name), 'w') as f:
+                f.write(f'The year {year}.')
+            entries.append({'title': f'{year} in review',
+                            'url': f'https://raw.githubusercontent.com/o/r/main/_posts/{name}'})
+        posts = load_posts(entries, blog_checkout)
+
+        registry = ResourceRegistry(server)
+        registry.sync(posts, mock_llms_txt_content)
+        updated, list_changed = registry.sync(posts, mock_llms_txt_content)
+        contents = asyncio.run(server.read_resource('blog://post/2019-12-31-year-in-review'))
+
+        assert updated == []
+        assert list_changed is False
+        assert list(contents)[0].content == 'The year 2019.'
+
+    def test_sync_removes_deleted_posts(self, server, mock_posts, mock_llms_txt_content):
+        """Test that posts gone from the corpus are unlisted."""
+        from resources import ResourceRegistry
+
+        registry = ResourceRegistry(server)
+        registry.sync(mock_posts, mock_llms_txt_content)
+        updated, list_changed = registry.sync(mock_posts[:2], mock_llms_txt_content)
+        uris = {str(r.uri) for r in asyncio.run(server.list_resources())}
+
+        assert updated == []
+        assert list_changed is True
+        assert 'blog://post/data-science-intro' not in uris
+
+    def test_advertises_subscribe_and_list_changed(self, server):
+        """Test that clients are told resources support subscriptions and list change notifications."""
+        from resources import ResourceRegistry
+
+        ResourceRegistry(server)
+        capabilities = server._mcp_server.create_initialization_options().capabilities
+
+        assert capabilities.resources.subscribe is True
+        assert capabilities.resources.listChanged is True
+
+    def test_subscribe_request_records_session(self, server):
+        """Test that resources/subscribe records the URI for the requesting session."""
+        from mcp import types
+        from mcp.server.lowlevel.server import request_ctx
+        from resources import ResourceRegistry
+
+        registry = ResourceRegistry(server)
+        session = Mock()
+        handler = server._mcp_server.request_handlers[types.SubscribeRequest]
+        request = types.SubscribeRequest(params=types.SubscribeRequestParams(uri='blog://post/python-tips'))
+
+        token = request_ctx.set(Mock(session=session))
+        try:
+            asyncio.run(handler(request))
+        finally:
+            request_ctx.reset(token)
+
+        assert registry.subscriptions[session] == {'blog://post/python-tips'}
+
+    def test_notify_only_subscribed_sessions(self, server):
+        """Test that updates go to subscribers only and list changes also reach the calling session."""
+        from resources import ResourceRegistry
+
+        registry = ResourceRegistry(server)
+        subscriber, other, caller = (Mock() for _ in range(3))
+        for session in (subscriber, other, caller):
+            session.send_resource_updated = AsyncMock()
+            session.send_resource_list_changed = AsyncMock()
+        registry.subscriptions[subscriber] = {'blog://post/python-tips'}
+        registry.subscriptions[other] = {'blog://index'}
+
+        asyncio.run(registry.notify(['blog://post/python-tips'], True, caller))
+
+        subscriber.send_resource_updated.assert_awaited_once()
+        assert str(subscriber.send_resource_updated.call_args[0][0]) == 'blog://post/python-tips'
+        other.send_resource_updated.assert_not_awaited()
+        caller.send_resource_updated.assert_not_awaited()
+        for session in (subscriber, other, caller):
+            session.send_resource_list_changed.assert_awaited_once()
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
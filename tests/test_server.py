@@ -1,9 +1,10 @@
 """
 Tests for the MCP server tools
 """
+import asyncio
 import sys
 import os
-from unittest.mock import patch, Mock
+from unittest.mock import patch, Mock, AsyncMock
 
 import pytest
 
@@ -38,7 +39,7 @@ class TestMCPServerTools:
             ]
         }
         
-        result = search_posts('python')
+        result = asyncio.run(search_posts('python'))
         
         assert 'Found 2 post(s) matching' in result
         assert 'Python Tips and Tricks' in result
@@ -58,7 +59,7 @@ class TestMCPServerTools:
             "organic_results": []
         }
         
-        result = search_posts('nonexistent')
+        result = asyncio.run(search_posts('nonexistent'))
         
         assert 'No posts found matching' in result
         assert 'nonexistent' in result
@@ -75,7 +76,7 @@ class TestMCPServerTools:
             "search_metadata": {"status": "Error"}
         }
         
-        result = search_posts('python')
+        result = asyncio.run(search_posts('python'))
         
         assert 'No posts found matching' in result
     
@@ -246,6 +247,7 @@ Content here...
         # Check that the module has the expected tool functions
         assert hasattr(server, 'search_posts')
         assert hasattr(server, 'get_post_content')
+        assert hasattr(server, 'suggest')
         
         # Check that they are callable
         assert callable(server.search_posts)
@@ -263,7 +265,7 @@ Content here...
             "organic_results": []
         }
         
-        search_posts('python tutorials')
+        asyncio.run(search_posts('python tutorials'))
         
         # Verify GoogleSearch was called with the correct parameters
         mock_google_search.assert_called_once()
@@ -271,6 +273,389 @@ Content here...
         assert 'site:jtemporal.com python tutorials' in call_args['q']
         assert 'api_key' in call_args
 
+    @patch('server._corpus', None)
+    @patch('server.requests.get')
+    def test_get_post_content_from_local_source(self, mock_get, mock_llms_txt_content, blog_checkout):
+        """Test that posts are read from the local blog source instead of GitHub."""
+        import server
+
+        mock_response = Mock(status_code=200, text=mock_llms_txt_content)
+        mock_response.raise_for_status = Mock()
+        mock_get.return_value = mock_response
+
+        with patch('server.BLOG_SOURCE_PATH', blog_checkout):
+            result = server.get_post_content('Introduction to Data Science')
+
+        assert 'Data science is the art of extracting insights' in result
+        # Only llms.txt is fetched, the post itself comes from disk
+        mock_get.assert_called_once()
+
+    @patch('server._corpus', None)
+    @patch('server.fetch_llms_txt')
+    def test_refresh_posts(self, mock_fetch, mock_llms_txt_content, blog_checkout):
+        """Test reloading the posts from the local blog source."""
+        import server
+
+        mock_fetch.return_value = mock_llms_txt_content
+
+        with patch('server.BLOG_SOURCE_PATH', blog_checkout):
+            result = asyncio.run(server.refresh_posts())
+
+        assert 'Loaded 3 post(s)' in result
+
+    @patch('server._corpus', None)
+    @patch('server._index', None)
+    @patch('server.fetch_llms_txt')
+    def test_get_index_builds_once(self, mock_fetch, mock_llms_txt_content, blog_checkout):
+        """Test that a cold get_index() reuses the index built while loading the corpus."""
+        import server
+
+        mock_fetch.return_value = mock_llms_txt_content
+
+        with patch('server.BLOG_SOURCE_PATH', blog_checkout), \
+                patch('server.PostIndex', wraps=server.PostIndex) as mock_post_index, \
+                patch('server.build_index', wraps=server.build_index) as mock_build_index:
+            index = server.get_index()
+
+        mock_build_index.assert_called_once()
+        mock_post_index.assert_not_called()
+        assert len(index.posts) == 3
+
+    def test_refresh_posts_without_source(self):
+        """Test that refreshing without a local blog source explains how to enable it."""
+        from server import refresh_posts
+
+        with patch('server.BLOG_SOURCE_PATH', ''):
+            result = asyncio.run(refresh_posts())
+
+        assert 'No local blog source configured' in result
+
+    @patch('server._index', None)
+    @patch('server.GoogleSearch')
+    @patch('server.get_corpus')
+    def test_search_posts_with_filters_uses_local_index(self, mock_get_corpus, mock_google_search, mock_posts):
+        """Test that filtered searches are answered locally without calling SerpApi."""
+        from server import search_posts
+
+        mock_get_corpus.return_value = mock_posts
+
+        with patch('server.BLOG_SOURCE_PATH', '/blog'):
+            result = asyncio.run(search_posts('python', tags=['python'], date_from='2024-01-10'))
+
+        mock_google_search.assert_not_called()
+        assert 'Found 1 post(s) matching' in result
+        assert 'Python Tips and Tricks' in result
+        assert 'Introduction to Data Science' not in result
+
+    @patch('server._index', None)
+    @patch('server.get_corpus')
+    def test_search_posts_with_broad_filter_is_capped(self, mock_get_corpus, mock_posts):
+        """Test that a filter matching many posts only returns the best SEARCH_RESULTS of them."""
+        from server import search_posts
+
+        mock_get_corpus.return_value = mock_posts
+
+        with patch('server.BLOG_SOURCE_PATH', '/blog'), patch('server.SEARCH_RESULTS', 1):
+            result = asyncio.run(search_posts('python decorators tutorial', lang='en'))
+
+        assert 'Found 1 post(s) matching' in result
+        assert 'Python Tips and Tricks' in result
+
+    @patch('server._index', None)
+    @patch('server.get_corpus')
+    def test_search_posts_with_invalid_date(self, mock_get_corpus, mock_posts):
+        """Test that malformed filter dates are reported."""
+        from server import search_posts
+
+        mock_get_corpus.return_value = mock_posts
+
+        with patch('server.BLOG_SOURCE_PATH', '/blog'):
+            result = asyncio.run(search_posts('python', date_to='yesterday'))
+
+        assert 'Invalid filter' in result
+
+    def test_search_posts_with_filters_without_source(self):
+        """Test that filters explain they need a local blog source."""
+        from server import search_posts
+
+        with patch('server.BLOG_SOURCE_PATH', ''):
+            result = asyncio.run(search_posts('python', lang='en'))
+
+        assert 'requires a local blog source' in result
+
+    @patch('server._index', None)
+    @patch('server.GoogleSearch')
+    @patch('server.get_corpus')
+    def test_search_posts_uses_local_snippets(self, mock_get_corpus, mock_google_search, mock_posts):
+        """Test that SerpApi snippets are replaced by highlighted local ones when the post is known."""
+        from server import search_posts
+
+        mock_get_corpus.return_value = mock_posts
+        mock_search_instance = Mock()
+        mock_google_search.return_value = mock_search_instance
+        mock_search_instance.get_dict.return_value = {
+            "search_metadata": {"status": "Success"},
+            "organic_results": [
+                {"title": "Python Tips", "link": "https://jtemporal.com/python-tips/", "snippet": "Stale snippet"},
+                {"title": "Other", "link": "https://jtemporal.com/unknown/", "snippet": "Remote snippet"},
+            ]
+        }
+
+        with patch('server.BLOG_SOURCE_PATH', '/blog'):
+            result = asyncio.run(search_posts('decorators'))
+
+        assert '**decorators**' in result
+        assert 'Stale snippet' not in result
+        assert 'Remote snippet' in result
+
+    @patch('server._suggester', None)
+    @patch('server.fetch_llms_txt')
+    def test_suggest(self, mock_fetch, mock_llms_txt_content):
+        """Test suggesting exact titles from the llms.txt listing."""
+        from server import suggest
+
+        mock_fetch.return_value = mock_llms_txt_content
+
+        result = suggest('intro')
+
+        assert "Suggestions for 'intro'" in result
+        assert '- Introduction to Data Science (post)' in result
+
+    @patch('server._suggester', None)
+    @patch('server.fetch_llms_txt')
+    def test_suggest_no_match(self, mock_fetch, mock_llms_txt_content):
+        """Test suggesting with a prefix that matches nothing."""
+        from server import suggest
+
+        mock_fetch.return_value = mock_llms_txt_content
+
+        assert "No suggestions for 'zzz'" in suggest('zzz')
+
+    @patch('server._suggester', None)
+    @patch('server._title_hits', {})
+    @patch('server.fetch_llms_txt')
+    def test_suggest_picks_up_new_posts_without_source(self, mock_fetch, mock_llms_txt_content):
+        """Test that the suggester follows llms.txt changes seen by get_post_content and after the TTL."""
+        import server
+
+        new_post = "\n- [Rust for Pythonistas](https://raw.githubusercontent.com/o/r/main/_posts/rust.md)\n"
+        mock_fetch.return_value = mock_llms_txt_content
+
+        with patch('server.BLOG_SOURCE_PATH', ''):
+            assert 'No suggestions' in server.suggest('rust')
+
+            mock_fetch.return_value = mock_llms_txt_content + new_post
+            with patch('server.fetch_raw_post', return_value='# Rust'):
+                server.get_post_content('Rust for Pythonistas')
+            assert '- Rust for Pythonistas (post)' in server.suggest('rust')
+
+            mock_fetch.return_value = mock_llms_txt_content
+            assert '- Rust for Pythonistas (post)' in server.suggest('rust')
+            with patch('server.SUGGESTER_TTL', -1):
+                assert 'No suggestions' in server.suggest('rust')
+
+    @patch('server._corpus', None)
+    @patch('server._suggester', None)
+    @patch('server._title_hits', {})
+    @patch('server.fetch_llms_txt')
+    def test_suggest_keeps_hits_across_refresh(self, mock_fetch, mock_llms_txt_content, blog_checkout):
+        """Test that title popularity survives a reload and llms.txt is fetched once per load."""
+        import server
+
+        mock_fetch.return_value = mock_llms_txt_content
+
+        with patch('server.BLOG_SOURCE_PATH', blog_checkout):
+            server.get_post_content('Python Tips')
+            asyncio.run(server.refresh_posts())
+            result = server.suggest('t', limit=1)
+
+        # One llms.txt fetch per corpus load, none for the suggester
+        assert mock_fetch.call_count == 2
+        assert '- Python Tips and Tricks (post)' in result
+
+    @patch('server._corpus', None)
+    @patch('server.fetch_llms_txt')
+    def test_refresh_posts_notifies_changed_resources(self, mock_fetch, mock_llms_txt_content, blog_checkout):
+        """Test that only subscribed resources whose content changed are reported to the client."""
+        import server
+        from resources import ResourceRegistry
+
+        mock_fetch.return_value = mock_llms_txt_content
+        ctx = Mock()
+        ctx.session.send_resource_updated = AsyncMock()
+        ctx.session.send_resource_list_changed = AsyncMock()
+
+        registry = ResourceRegistry(server.FastMCP(name="test"))
+
+        with patch('server.BLOG_SOURCE_PATH', blog_checkout), patch('server._resources', registry):
+            asyncio.run(server.refresh_posts())
+            registry.subscriptions[ctx.session] = {'blog://post/python-tips', 'blog://post/web-development'}
+            with open(os.path.join(blog_checkout, '_posts', '2024-01-15-python-tips.md'), 'a') as f:
+                f.write('\nA new paragraph.\n')
+            result = asyncio.run(server.refresh_posts(ctx))
+
+        assert '1 resource(s) changed' in result
+        ctx.session.send_resource_updated.assert_awaited_once()
+        assert str(ctx.session.send_resource_updated.call_args[0][0]) == 'blog://post/python-tips'
+        ctx.session.send_resource_list_changed.assert_not_awaited()
+
+    @patch('server.get_corpus')
+    def test_read_post_resource(self, mock_get_corpus, mock_posts):
+        """Test reading a post through the blog://post/{slug} resource template."""
+        from server import read_post
+
+        mock_get_corpus.return_value = mock_posts
+
+        with patch('server.BLOG_SOURCE_PATH', '/blog'):
+            assert 'Web development is an exciting field' in read_post('web-development')
+            with pytest.raises(ValueError):
+                read_post('missing')
+
+    @patch('server.get_corpus')
+    def test_read_post_resource_without_source(self, mock_get_corpus):
+        """Test that the post template explains how to enable it instead of loading from an empty path."""
+        from server import read_post
+
+        with patch('server.BLOG_SOURCE_PATH', ''):
+            with pytest.raises(ValueError, match='blog_source_path'):
+                read_post('web-development')
+        mock_get_corpus.assert_not_called()
+
+    @patch('server._index', None)
+    @patch('server.GoogleSearch')
+    @patch('server.get_corpus')
+    def test_hybrid_search_confident_local(self, mock_get_corpus, mock_google_search, mock_posts):
+        """Test that confident local results are returned without calling SerpApi."""
+        from server import search_posts
+
+        mock_get_corpus.return_value = mock_posts
+
+        with patch('server.BLOG_SOURCE_PATH', '/blog'), patch('server.SEARCH_MODE', 'hybrid'):
+            result = asyncio.run(search_posts('pandas numpy'))
+
+        mock_google_search.assert_not_called()
+        assert 'Found 1 post(s) matching' in result
+        assert 'Introduction to Data Science' in result
+        assert '**pandas**' in result
+
+    @patch('server._index', None)
+    @patch('server.GoogleSearch')
+    @patch('server.get_corpus')
+    def test_hybrid_search_fuses_serpapi(self, mock_get_corpus, mock_google_search, mock_posts):
+        """Test that weak local results are fused with SerpApi and deduplicated by URL."""
+        from server import search_posts
+
+        mock_get_corpus.return_value = mock_posts
+        mock_search_instance = Mock()
+        mock_google_search.return_value = mock_search_instance
+        mock_search_instance.get_dict.return_value = {
+            "search_metadata": {"status": "Success"},
+            "organic_results": [
+                {"title": "Python Tips", "link": "https://jtemporal.com/python-tips/", "snippet": "Remote"},
+                {"title": "Django for Beginners", "link": "https://jtemporal.com/django-beginners/",
+                 "snippet": "Start your Django journey..."},
+            ]
+        }
+
+        with patch('server.BLOG_SOURCE_PATH', '/blog'), patch('server.SEARCH_MODE', 'hybrid'):
+            result = asyncio.run(search_posts('python django'))
+
+        mock_google_search.assert_called_once()
+        assert 'Found 3 post(s) matching' in result
+        assert result.count('Python Tips and Tricks') == 1
+        assert 'https://jtemporal.com/python-tips/' in result
+        assert 'Django for Beginners' in result
+        assert result.index('Python Tips and Tricks') < result.index('Django for Beginners')
+
+    @patch('server._index', None)
+    @patch('server.GoogleSearch')
+    @patch('server.get_corpus')
+    def test_hybrid_search_serpapi_failure(self, mock_get_corpus, mock_google_search, mock_posts):
+        """Test that local results are still returned when SerpApi fails."""
+        from server import search_posts
+
+        mock_get_corpus.return_value = mock_posts
+        mock_search_instance = Mock()
+        mock_google_search.return_value = mock_search_instance
+        mock_search_instance.get_dict.return_value = {"search_metadata": {"status": "Error"}}
+
+        with patch('server.BLOG_SOURCE_PATH', '/blog'), patch('server.SEARCH_MODE', 'hybrid'):
+            result = asyncio.run(search_posts('python django'))
+
+        assert 'Found 2 post(s) matching' in result
+        assert 'No posts found' not in result
+
+    @patch('server._index', None)
+    @patch('server.GoogleSearch')
+    @patch('server.get_corpus')
+    def test_hybrid_search_serpapi_deadline(self, mock_get_corpus, mock_google_search, mock_posts):
+        """Test that a SerpApi call still running at the deadline is abandoned and its timeout is bounded."""
+        import threading
+        from server import search_posts
+
+        mock_get_corpus.return_value = mock_posts
+        started, release = threading.Event(), threading.Event()
+        mock_search_instance = Mock()
+        mock_google_search.return_value = mock_search_instance
+        mock_search_instance.get_dict.side_effect = lambda: started.set() or release.wait(5) and {
+            "search_metadata": {"status": "Success"},
+            "organic_results": [{"title": "Late Result", "link": "https://jtemporal.com/late/", "snippet": ""}],
+        }
+
+        try:
+            with patch('server.BLOG_SOURCE_PATH', '/blog'), patch('server.SEARCH_MODE', 'hybrid'), \
+                    patch('server.SERPAPI_DEADLINE', 0.05):
+                result = asyncio.run(search_posts('python django'))
+
+            # SerpApi was asked but its answer did not make it into the result
+            assert started.wait(5)
+            assert not release.is_set()
+            assert 'Late Result' not in result
+            assert 'Python Tips and Tricks' in result
+            assert mock_search_instance.timeout == 0.05
+        finally:
+            release.set()
+
+    @patch('server._index', None)
+    @patch('server.get_corpus')
+    def test_hybrid_search_deadline_includes_snippet_time(self, mock_get_corpus, mock_posts):
+        """Test that time spent building local snippets counts against the SerpApi deadline."""
+        import threading
+        import time
+        from server import search_posts
+
+        mock_get_corpus.return_value = mock_posts
+        future = Mock()
+        future.result.return_value = []
+
+        with patch('server.BLOG_SOURCE_PATH', '/blog'), patch('server.SEARCH_MODE', 'hybrid'), \
+                patch('server.SERPAPI_DEADLINE', 0.05), \
+                patch('server._serpapi_executor') as mock_executor, \
+                patch('server._serpapi_slots', threading.BoundedSemaphore(1)), \
+                patch('server.make_snippet', side_effect=lambda post, query: time.sleep(0.05) or None):
+            mock_executor.submit.return_value = future
+            asyncio.run(search_posts('python django'))
+
+        assert future.result.call_args.kwargs['timeout'] == 0.0
+
+    @patch('server._index', None)
+    @patch('server.GoogleSearch')
+    @patch('server.get_corpus')
+    def test_hybrid_search_skips_serpapi_when_workers_busy(self, mock_get_corpus, mock_google_search, mock_posts):
+        """Test that no SerpApi call is queued while every worker is still busy."""
+        import threading
+        from server import search_posts
+
+        mock_get_corpus.return_value = mock_posts
+
+        with patch('server.BLOG_SOURCE_PATH', '/blog'), patch('server.SEARCH_MODE', 'hybrid'), \
+                patch('server._serpapi_slots', threading.BoundedSemaphore(1)) as slots:
+            slots.acquire()
+            result = asyncio.run(search_posts('python django'))
+
+        mock_google_search.assert_not_called()
+        assert 'Python Tips and Tricks' in result
+
 
 if __name__ == '__main__':
     pytest.main([__file__])
\ No newline at end of file
@@ -0,0 +1,67 @@
+"""
+Tests for the snippets.py module
+"""
+import sys
+import os
+
+import pytest
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+class TestSnippetsModule:
+    """Test cases for locally generated, highlighted snippets."""
+
+    def test_split_passages_offsets(self):
+        """Test that passages cover the text and respect the word budget."""
+        from snippets import split_passages
+
+        text = "one\ntwo three\nfour five six seven\n" + " ".join(f"w{i}" for i in range(10))
+        passages = split_passages(text, passage_words=4)
+
+        assert [text[start:end] for start, end in passages] == [
+            "one\ntwo three",
+            "four five six seven",
+            "w0 w1 w2 w3",
+            "w4 w5 w6 w7",
+            "w8 w9",
+        ]
+
+    def test_highlight_whole_words(self):
+        """Test that only whole-word, case-insensitive matches are highlighted."""
+        from snippets import highlight
+
+        assert highlight("Python and pythonic python", {"python"}) == "**Python** and pythonic **python**"
+
+    def test_make_snippet_picks_best_passage(self, mock_posts):
+        """Test that the passage matching the most query terms is used."""
+        from snippets import make_snippet
+
+        snippet = make_snippet(mock_posts[2], "pandas numpy")
+
+        assert "**pandas**" in snippet
+        assert "**numpy**" in snippet
+
+    def test_make_snippet_no_match(self, mock_posts):
+        """Test that posts without any query term produce no snippet."""
+        from snippets import make_snippet
+
+        assert make_snippet(mock_posts[0], "kubernetes") is None
+
+    def test_make_snippet_windows_long_passages(self):
+        """Test that long passages are cut around the first hit with ellipses."""
+        from snippets import make_snippet, split_passages
+
+        text = " ".join(["filler"] * 30) + " target " + " ".join(["filler"] * 30)
+        post = {"text": text, "passages": split_passages(text, passage_words=100)}
+
+        snippet = make_snippet(post, "target", max_chars=60)
+
+        assert "**target**" in snippet
+        assert snippet.startswith("…") and snippet.endswith("…")
+        assert len(snippet) <= 60 + len("**") * 2 + 2
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])
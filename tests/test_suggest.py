@@ -0,0 +1,96 @@
+"""
+Tests for the suggest.py module
+"""
+import sys
+import os
+
+import pytest
+
+# Add src directory to path for imports
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(__file__)), 'src'))
+
+
+ENTRIES = [
+    {"title": "Creating a Travel Diary With Django", "url": "https://example.com/a.md"},
+    {"title": "Django for Beginners", "url": "https://example.com/b.md"},
+    {"title": "Python Tips and Tricks", "url": "https://example.com/c.md"},
+    {"title": "Python Packaging", "url": "https://example.com/d.md"},
+]
+
+
+class TestSuggester:
+    """Test cases for prefix completion over titles and terms."""
+
+    def test_suggest_title_prefix(self):
+        """Test completing the beginning of a title."""
+        from suggest import Suggester
+
+        assert Suggester(ENTRIES).suggest("Creating a tr") == [("Creating a Travel Diary With Django", "post")]
+
+    def test_suggest_word_inside_title(self):
+        """Test completing from a word in the middle of a title."""
+        from suggest import Suggester
+
+        assert Suggester(ENTRIES).suggest("travel  dia") == [("Creating a Travel Diary With Django", "post")]
+
+    def test_suggest_frequent_terms(self):
+        """Test that terms shared by several titles are interleaved with titles by popularity."""
+        from suggest import Suggester
+
+        suggester = Suggester(ENTRIES)
+
+        assert suggester.suggest("pyth") == [
+            ("python", "term"),
+            ("Python Packaging", "post"),
+            ("Python Tips and Tricks", "post"),
+        ]
+
+        for _ in range(2):
+            suggester.record_hit("Python Tips and Tricks")
+
+        # Posts win ties with terms
+        assert suggester.suggest("p", limit=2) == [("Python Tips and Tricks", "post"), ("python", "term")]
+
+    def test_suggest_matches_full_scan(self):
+        """Test that the best-first lookup returns exactly the top completions of a full scan."""
+        import random
+        from suggest import Suggester
+
+        rng = random.Random(7)
+        words = "python django data science web api tips guide testing deploy".split()
+        entries = [{"title": f"{' '.join(rng.sample(words, 3))} {number}", "url": ""} for number in range(300)]
+        suggester = Suggester(entries)
+        for _ in range(200):
+            suggester.record_hit(rng.choice(entries)["title"])
+
+        for prefix in ("p", "py", "d", "data sc", "web 1", "zz"):
+            matches = {completion for key, completion in zip(suggester.keys, suggester.completions)
+                       if key.startswith(prefix)}
+            expected = sorted(matches, key=lambda match: suggester._rank(*match))[:10]
+            assert suggester.suggest(prefix) == expected
+
+    def test_suggest_ranked_by_hits(self):
+        """Test that requested titles move up the ranking."""
+        from suggest import Suggester
+
+        suggester = Suggester(ENTRIES)
+        suggester.record_hit("Python Tips and Tricks")
+
+        assert suggester.suggest("python") == [
+            ("python", "term"),
+            ("Python Tips and Tricks", "post"),
+            ("Python Packaging", "post"),
+        ]
+
+    def test_suggest_no_match(self):
+        """Test that unknown and empty prefixes return nothing."""
+        from suggest import Suggester
+
+        suggester = Suggester(ENTRIES)
+
+        assert suggester.suggest("rust") == []
+        assert suggester.suggest("   ") == []
+
+
+if __name__ == '__main__':
+    pytest.main([__file__])